@@ -3,52 +3,223 @@
 """STIR Macro Analyst - Root Agent."""
 
 import logging
+import threading
 import warnings
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator
 
 from dotenv import load_dotenv
 from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
 
 from . import agent_prompt
+from .callbacks import prefetch_market_context, record_contract_spec
 from .tools.policy_rate_tool import get_policy_rate  
-from .tools.stir_scenario_tool import analyze_stir_scenarios  
+from .tools.stir_scenario_tool import analyze_stir_scenarios, analyze_stir_scenarios_batch
 from .tools.meeting_dates_tool import count_central_bank_meetings
 from .tools.plot_rnd_tool import plot_rnd_analysis  
+from .tools.stir_pipeline_tool import run_full_stir_comparison
+from .tools.formatting_examples_tool import get_formatting_examples
+
+if TYPE_CHECKING:
+    from google.adk.models.lite_llm import LiteLlm
+    from google.adk.runners import Runner
 
 warnings.filterwarnings("ignore", category=UserWarning, module=".*pydantic.*")
 
 logger = logging.getLogger(__name__)
 
-# Carica variabili d'ambiente da .env (inclusa OPENAI_API_KEY)
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    logger.warning("OPENAI_API_KEY non è settata. Le chiamate a OpenAI falliranno.")
-
-# Modello OpenAI via LiteLlm / ADK
-MODEL = LiteLlm(
-    model="openai/gpt-4o-mini",
-    api_key=OPENAI_API_KEY,
-)
-
-logger.debug("Using MODEL: %s", MODEL)
-
-root_agent = Agent(
-    model=MODEL,
-    name="stir_macro_analyst",
-    description=(
-        "Expert quantitative analyst for Short-Term Interest Rate (STIR) futures "
-        "and options markets. Performs SABR calibration, generates Risk Neutral "
-        "Densities, and analyzes market-implied rate expectations through scenario "
-        "probability analysis."
-    ),
-    instruction=agent_prompt.SYSTEM_PROMPT,
-    tools=[
-        get_policy_rate,         
-        analyze_stir_scenarios,  
-        plot_rnd_analysis, 
-        count_central_bank_meetings     
-    ],
-)
+
+# Cheap, fast tier for routing/tool-calling turns; stronger tier for the final interpretation
+FAST_MODEL_NAME = "openai/gpt-4.1-nano"
+SMART_MODEL_NAME = "openai/gpt-4o-mini"
+
+# Set STIR_LLM_WARMUP=0 to skip the 1-token warmup call made when each model is built
+LLM_WARMUP = os.getenv("STIR_LLM_WARMUP", "1") != "0"
+
+
+def _configure_http_pool() -> None:
+    """Shared keep-alive HTTP/2 clients for LiteLLM, so connections survive across requests."""
+    import httpx
+    import litellm
+
+    limits = httpx.Limits(max_keepalive_connections=20)
+    if litellm.aclient_session is None:
+        litellm.aclient_session = httpx.AsyncClient(http2=True, limits=limits)
+    if litellm.client_session is None:
+        litellm.client_session = httpx.Client(http2=True, limits=limits)
+
+
+def _warm_up(model_name: str, api_key: str) -> None:
+    # DNS, TLS and the provider-side route are hot before the first user request
+    import litellm
+
+    try:
+        litellm.completion(
+            model=model_name,
+            messages=[{"role": "user", "content": "ping"}],
+            max_tokens=1,
+            api_key=api_key,
+        )
+        logger.debug("Warmed up %s", model_name)
+    except Exception as e:
+        logger.debug(f"Warmup of {model_name} failed: {e}")
+
+
+@lru_cache(maxsize=None)
+def _build_model(model_name: str) -> 'LiteLlm':
+    # Imported here: litellm alone costs over a second at import time
+    from google.adk.models.lite_llm import LiteLlm
+
+    # Carica variabili d'ambiente da .env (inclusa OPENAI_API_KEY)
+    load_dotenv()
+
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        logger.warning("OPENAI_API_KEY non è settata. Le chiamate a OpenAI falliranno.")
+
+    _configure_http_pool()
+
+    model = LiteLlm(
+        model=model_name,
+        api_key=openai_api_key,
+    )
+    logger.debug("Using MODEL: %s", model)
+
+    if LLM_WARMUP and openai_api_key:
+        threading.Thread(
+            target=_warm_up,
+            args=(model_name, openai_api_key),
+            name=f"llm-warmup-{model_name}",
+            daemon=True,
+        ).start()
+
+    return model
+
+
+def get_fast_model() -> 'LiteLlm':
+    """Builds the fast model used by the router and specialist agents on first use."""
+    return _build_model(FAST_MODEL_NAME)
+
+
+def get_model() -> 'LiteLlm':
+    """Builds the model used for the final interpretation on first use."""
+    return _build_model(SMART_MODEL_NAME)
+
+
+def _build_interpreter_agent(name: str) -> Agent:
+    # An ADK agent has a single parent: each specialist gets its own interpreter
+    return Agent(
+        model=get_model(),
+        name=name,
+        description=(
+            "Writes the final answer (policy context, probability table and "
+            "interpretation) from STIR analyses already run in the conversation."
+        ),
+        instruction=agent_prompt.INTERPRETER_PROMPT,
+        tools=[get_formatting_examples],
+        # Answers once and hands the next user turn back to the specialist
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+    )
+
+
+def _build_single_date_agent() -> Agent:
+    return Agent(
+        model=get_fast_model(),
+        name="single_date_agent",
+        description="Analyzes one STIR contract on ONE date: scenario probabilities from the RND.",
+        instruction=agent_prompt.SINGLE_DATE_PROMPT,
+        tools=[
+            get_policy_rate,
+            analyze_stir_scenarios,
+            plot_rnd_analysis
+        ],
+        sub_agents=[_build_interpreter_agent("single_date_interpreter")],
+        before_agent_callback=record_contract_spec,
+        before_model_callback=prefetch_market_context,
+    )
+
+
+def _build_comparison_agent() -> Agent:
+    return Agent(
+        model=get_fast_model(),
+        name="comparison_agent",
+        description=(
+            "Compares one STIR contract between TWO dates: probability shifts, "
+            "meeting count and RND charts."
+        ),
+        instruction=agent_prompt.COMPARISON_PROMPT,
+        tools=[
+            get_policy_rate,
+            run_full_stir_comparison,
+            count_central_bank_meetings,
+            analyze_stir_scenarios_batch,
+            plot_rnd_analysis
+        ],
+        sub_agents=[_build_interpreter_agent("comparison_interpreter")],
+        before_agent_callback=record_contract_spec,
+        before_model_callback=prefetch_market_context,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_root_agent() -> Agent:
+    """Builds the root (router) agent and its specialists on first use."""
+    return Agent(
+        model=get_fast_model(),
+        name="stir_macro_analyst",
+        description=(
+            "Expert quantitative analyst for Short-Term Interest Rate (STIR) futures "
+            "and options markets. Performs SABR calibration, generates Risk Neutral "
+            "Densities, and analyzes market-implied rate expectations through scenario "
+            "probability analysis."
+        ),
+        instruction=agent_prompt.SYSTEM_PROMPT,
+        sub_agents=[_build_single_date_agent(), _build_comparison_agent()],
+        # Specialists run on later turns too, so they carry the same callbacks
+        before_agent_callback=record_contract_spec,
+        before_model_callback=prefetch_market_context,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # ADK looks up `root_agent` on this module: build it only when asked for
+    if name == "root_agent":
+        return get_root_agent()
+    if name in ("MODEL", "SMART_MODEL"):
+        return get_model()
+    if name == "FAST_MODEL":
+        return get_fast_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Streaming is selected per run, not on LiteLlm (ADK drops a `stream` kwarg there).
+# With SSE the final interpretation reaches the user token by token, and LiteLlm
+# asks for usage stats (stream_options.include_usage) on the last chunk.
+RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+async def stream_agent_response(
+    runner: 'Runner',
+    user_id: str,
+    session_id: str,
+    message: str
+) -> AsyncIterator[str]:
+    """Runs one user turn on `runner` and yields text chunks as soon as they arrive."""
+    content = types.Content(role="user", parts=[types.Part(text=message)])
+
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=content,
+        run_config=RUN_CONFIG,
+    ):
+        # Partial events carry the streamed deltas; the final aggregated event repeats them
+        if not event.partial or not event.content or not event.content.parts:
+            continue
+        for part in event.content.parts:
+            if part.text:
+                yield part.text
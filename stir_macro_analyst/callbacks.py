@@ -0,0 +1,86 @@
+# callbacks.py
+
+"""Agent callbacks."""
+
+import logging
+import re
+from dataclasses import asdict
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from .core import ContractSpec, get_policy_rate_for_currency, count_meetings_in_range
+from .core.contracts import _TICKER_PATTERN
+from .tools.prefetch import prefetch, today_yyyymmdd
+from .tools.stir_scenario_tool import CONTRACT_SPEC_KEY
+
+logger = logging.getLogger(__name__)
+
+_TICKER_RE = re.compile(rf'\b{_TICKER_PATTERN}\b')
+_DATE_RE = re.compile(r'\b(20\d{6})\b')
+
+
+def _find_contract_spec(text: str) -> Optional[ContractSpec]:
+    ticker = _TICKER_RE.search(text.upper())
+    if ticker is None:
+        return None
+    try:
+        return ContractSpec.from_ticker(ticker.group(0))
+    except ValueError:
+        return None
+
+
+def record_contract_spec(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback: parses the contract named in the user message once per turn.
+
+    The ContractSpec is stored in session state under CONTRACT_SPEC_KEY, so tools
+    read the currency and expiry fields instead of re-parsing the ticker.
+    """
+    content = callback_context.user_content
+    if content is None or not content.parts:
+        return None
+
+    spec = _find_contract_spec(" ".join(p.text for p in content.parts if p.text))
+    if spec is not None:
+        callback_context.state[CONTRACT_SPEC_KEY] = asdict(spec)
+
+    return None
+
+
+def prefetch_market_context(
+    callback_context: CallbackContext,
+    llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    before_model_callback: starts the policy-rate and meeting-count lookups early.
+
+    On a new user message naming a contract (and two YYYYMMDD dates for the meeting
+    count), the lookups the tools will need later run while the model is still
+    writing the plan. get_policy_rate and count_central_bank_meetings then pick up
+    the result instead of fetching it. Never alters the request (returns None).
+    """
+    if not llm_request.contents:
+        return None
+
+    last = llm_request.contents[-1]
+    # Only on a fresh user turn, not on each model call following a tool response
+    if last.role != "user" or not last.parts or any(p.function_response for p in last.parts):
+        return None
+
+    text = " ".join(p.text for p in last.parts if p.text)
+    spec = _find_contract_spec(text)
+    if spec is None:
+        return None
+    currency = spec.currency
+
+    today = today_yyyymmdd()
+    prefetch(("policy_rate", currency, today), get_policy_rate_for_currency, currency, today)
+
+    dates = sorted(set(_DATE_RE.findall(text)))
+    if len(dates) == 2:
+        prefetch(("meetings", currency, dates[0], dates[1]), count_meetings_in_range, currency, *dates)
+
+    return None
@@ -1,51 +1,60 @@
 # core/__init__.py
 
-from .contracts import normalize_ticker, infer_currency, parse_contract_code
-from .rates_engine import (
-    calculate_time_to_expiry,
-    interpolate_discount_rate,
-    get_rate_tenor
-)
-from .market_data import (
-    get_futures_settlement,
-    get_option_chain_filtered,
-    get_option_settlements,
-    get_discount_curve
-)
-from .sabr_calibration import (
-    SABRParameters,
-    calculate_implied_vol,
-    calibrate_sabr
-)
-from .rnd_engine import generate_rnd
-from .scenarios import (
-    integrate_rnd_over_range,
-    compute_scenario_probabilities,
-    calculate_probability_shifts
-)
-from .policy_rates import get_policy_rate_for_currency
-from .stir_analysis import analyze_stir_contract
-from .meeting_dates import count_meetings_in_range
-
-__all__ = [
-    'normalize_ticker',
-    'infer_currency',
-    'parse_contract_code',
-    'calculate_time_to_expiry',
-    'interpolate_discount_rate',
-    'get_rate_tenor',
-    'get_futures_settlement',
-    'get_option_chain_filtered',
-    'get_option_settlements',
-    'get_discount_curve',
-    'SABRParameters',
-    'calculate_implied_vol',
-    'calibrate_sabr',
-    'generate_rnd',
-    'integrate_rnd_over_range',
-    'compute_scenario_probabilities',
-    'calculate_probability_shifts',
-    'get_policy_rate_for_currency',
-    'analyze_stir_contract',
-    'count_meetings_in_range'
-]
+"""
+Core analytics, loaded lazily (PEP 562).
+
+Names are resolved to their submodule on first access, so importing the package
+does not pull in scipy, pysabr or Bloomberg until an analysis actually runs.
+"""
+
+import importlib
+from typing import Any
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'normalize_ticker': 'contracts',
+    'infer_currency': 'contracts',
+    'parse_contract_code': 'contracts',
+    'ContractSpec': 'contracts',
+    'calculate_time_to_expiry': 'rates_engine',
+    'interpolate_discount_rate': 'rates_engine',
+    'get_rate_tenor': 'rates_engine',
+    'get_futures_settlement': 'market_data',
+    'get_option_strikes': 'market_data',
+    'filter_otm_options': 'market_data',
+    'get_option_chain_filtered': 'market_data',
+    'get_option_settlements': 'market_data',
+    'get_discount_curve': 'market_data',
+    'SABRParameters': 'sabr_calibration',
+    'calculate_implied_vol': 'sabr_calibration',
+    'calculate_implied_vol_vec': 'sabr_calibration',
+    'calibrate_sabr': 'sabr_calibration',
+    'calibrate_from_prices': 'sabr_calibration',
+    'generate_rnd': 'rnd_engine',
+    'generate_rnd_on_grid': 'rnd_engine',
+    'integrate_rnd_over_range': 'scenarios',
+    'compute_scenario_probabilities': 'scenarios',
+    'calculate_probability_shifts': 'scenarios',
+    'build_policy_scenarios': 'scenarios',
+    'get_policy_rate_for_currency': 'policy_rates',
+    'analyze_stir_contract': 'stir_analysis',
+    'analyze_stir_contract_async': 'stir_analysis',
+    'analyze_stir_contract_pair': 'stir_analysis',
+    'rescore_stir_analysis': 'stir_analysis',
+    'count_meetings_in_range': 'meeting_dates'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
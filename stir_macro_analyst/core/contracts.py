@@ -1,47 +1,74 @@
 # core/contracts.py
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Tuple
 
+# Root (SFR/ER/SFI), month code and single year digit, e.g. SFRZ6, ERH5, SFIM4.
+# The one ticker grammar: anchored here for parsing, searched for in free text by callbacks
+_TICKER_PATTERN = r'([A-Z]{2,3})([FGHJKMNQUVXZ])(\d)'
+_TICKER_RE = re.compile(rf'^{_TICKER_PATTERN}')
 
+_CCY_MAP = {"SFR": "USD", "ER": "EUR", "SFI": "GBP"}
+
+_MONTH_MAP = {
+    'F': 'January', 'G': 'February', 'H': 'March',
+    'J': 'April', 'K': 'May', 'M': 'June',
+    'N': 'July', 'Q': 'August', 'U': 'September',
+    'V': 'October', 'X': 'November', 'Z': 'December'
+}
+
+
+@lru_cache(maxsize=512)
 def normalize_ticker(ticker: str) -> str:
     ticker = ticker.upper().strip()
-    if " COMDTY" not in ticker and " COMB " not in ticker:
-        if not any(x in ticker for x in ["COMDTY", "COMB"]):
-            ticker = f"{ticker} Comdty"
+    if "COMDTY" not in ticker and "COMB" not in ticker:
+        ticker = f"{ticker} Comdty"
     return ticker
 
 
+@lru_cache(maxsize=512)
 def infer_currency(ticker: str) -> str:
     ticker = ticker.upper().strip()
-    prefix = ticker[:3]
-    
-    if prefix.startswith("SFR"):
-        return "USD"
-    elif prefix.startswith("ER"):
-        return "EUR"
-    elif prefix.startswith("SFI"):
-        return "GBP"
-    else:
+    m = _TICKER_RE.match(ticker)
+
+    if m is None or m.group(1) not in _CCY_MAP:
         raise ValueError(f"Cannot infer currency from ticker {ticker}")
 
+    return _CCY_MAP[m.group(1)]
 
+
+@lru_cache(maxsize=512)
 def parse_contract_code(ticker: str) -> Tuple[str, str]:
-    ticker = ticker.upper().strip()
-    
-    month_map = {
-        'F': 'January', 'G': 'February', 'H': 'March',
-        'J': 'April', 'K': 'May', 'M': 'June',
-        'N': 'July', 'Q': 'August', 'U': 'September',
-        'V': 'October', 'X': 'November', 'Z': 'December'
-    }
-    
-    if len(ticker) >= 5:
-        month_code = ticker[3]
-        year_digit = ticker[4]
-        
-        month_name = month_map.get(month_code, 'Unknown')
-        year = f"202{year_digit}"
-        
-        return (month_name, year)
-    
-    return ('Unknown', 'Unknown')
\ No newline at end of file
+    m = _TICKER_RE.match(ticker.upper().strip())
+
+    if m is None:
+        return ('Unknown', 'Unknown')
+
+    month_name = _MONTH_MAP[m.group(2)]
+    year = f"202{m.group(3)}"
+
+    return (month_name, year)
+
+
+@dataclass(frozen=True, slots=True)
+class ContractSpec:
+    """Contract fields derived once from the ticker, so tools do not re-parse it."""
+    ticker: str
+    currency: str
+    month_name: str
+    year: str
+
+    @classmethod
+    def from_ticker(cls, ticker: str) -> 'ContractSpec':
+        # infer_currency first: it raises ValueError for a ticker outside the grammar
+        currency = infer_currency(ticker)
+        month_name, year = parse_contract_code(ticker)
+
+        return cls(
+            ticker=normalize_ticker(ticker),
+            currency=currency,
+            month_name=month_name,
+            year=year
+        )
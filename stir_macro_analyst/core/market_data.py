@@ -3,75 +3,97 @@
 """High-level market data retrieval."""
 
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, date as dt_date
 from typing import Dict, List, Any
 from ..infra import (
-    BloombergConnection,
+    shared_connection,
     fetch_reference_data,
     fetch_historical_data,
+    fetch_historical_data_multi,
     fetch_option_chain,
     DISCOUNT_CURVE_MAPPING,
     BBG_HOST,
     BBG_PORT
 )
-from .rates_engine import get_rate_tenor
+from .rates_engine import curve_dtes, parse_yyyymmdd
+
+# Option series (ticker root without the C/P letter) -> OPT_EXPIRE_DT, invariant over time
+_OPTION_EXPIRY_CACHE: Dict[str, dt_date] = {}
 
 
 def get_futures_settlement(ticker: str, date: str) -> Dict[str, Any]:
     """Get futures settlement price for a specific date."""
-    with BloombergConnection(BBG_HOST, BBG_PORT) as conn:
+    with shared_connection(BBG_HOST, BBG_PORT) as conn:
         df = fetch_historical_data(conn, ticker, "PX_SETTLE", date, date, "DAILY")
-        
-        if df.empty:
-            raise ValueError(f"No settlement data for {ticker} on {date}")
-        
-        settlement = float(df.iloc[0]["PX_SETTLE"])
-        
-        return {
-            "ticker": ticker,
-            "date": date,
-            "settlement_price": settlement,
-            "implied_rate": 100 - settlement
-        }
+    
+    # Outside the block: missing data is not a reason to drop the session
+    if df.empty:
+        raise ValueError(f"No settlement data for {ticker} on {date}")
+    
+    settlement = float(df.iloc[0]["PX_SETTLE"])
+    
+    return {
+        "ticker": ticker,
+        "date": date,
+        "settlement_price": settlement,
+        "implied_rate": 100 - settlement
+    }
 
 
-def get_option_chain_filtered(
-    futures_code: str,
-    fut_settlement: float,
-    min_settlement: float = 0.02
-) -> List[str]:
-    """Get filtered OTM option chain."""
-    with BloombergConnection(BBG_HOST, BBG_PORT) as conn:
+def get_option_strikes(futures_code: str) -> List[float]:
+    """Get the sorted strikes listed in the option chain (date-independent)."""
+    with shared_connection(BBG_HOST, BBG_PORT) as conn:
         option_tickers = fetch_option_chain(conn, futures_code)
     
-    fcode = futures_code.split()[0]
-    asset_class = futures_code.split()[1] if len(futures_code.split()) > 1 else "Comdty"
-    
-    strike_list = []
+    strikes = set()
     for opt in option_tickers:
-        parts = opt.split()
+        parts = opt.split(maxsplit=2)
         if len(parts) >= 2:
             try:
-                strike = float(parts[1])
-                strike_list.append(strike)
+                strikes.add(float(parts[1]))
             except ValueError:
                 continue
     
-    strikes = sorted(set(strike_list))
+    return sorted(strikes)
+
+
+def filter_otm_options(
+    futures_code: str,
+    strikes: List[float],
+    fut_settlement: float
+) -> List[str]:
+    """Build the OTM option tickers (puts below the futures price, calls above)."""
+    code_parts = futures_code.split()
+    fcode = code_parts[0]
+    asset_class = code_parts[1] if len(code_parts) > 1 else "Comdty"
     
-    filtered_tickers = []
-    for strike in strikes:
-        if fut_settlement >= strike:
-            filtered_tickers.append(f"{fcode}P {strike} COMB {asset_class}")
-        else:
-            filtered_tickers.append(f"{fcode}C {strike} COMB {asset_class}")
+    put_prefix = f"{fcode}P "
+    call_prefix = f"{fcode}C "
+    suffix = f" COMB {asset_class}"
     
-    return filtered_tickers
+    return [
+        f"{put_prefix if fut_settlement >= strike else call_prefix}{strike}{suffix}"
+        for strike in strikes
+    ]
+
+
+def get_option_chain_filtered(
+    futures_code: str,
+    fut_settlement: float,
+    min_settlement: float = 0.02
+) -> List[str]:
+    """Get filtered OTM option chain."""
+    return filter_otm_options(futures_code, get_option_strikes(futures_code), fut_settlement)
 
 
 def get_option_settlements(option_tickers: List[str], date: str) -> pd.DataFrame:
-    """Get settlement prices for multiple options."""
-    with BloombergConnection(BBG_HOST, BBG_PORT) as conn:
+    """
+    Get settlement prices for multiple options.
+    
+    The option series expiry is fetched on the same connection (once per series)
+    and returned as df.attrs['opt_expire_dt'].
+    """
+    with shared_connection(BBG_HOST, BBG_PORT) as conn:
         data = {
             'CODE': [],
             'OPTION_TYPE': [],
@@ -79,8 +101,10 @@ def get_option_settlements(option_tickers: List[str], date: str) -> pd.DataFrame
             'SETTLEMENT': []
         }
         
+        settlements = fetch_historical_data_multi(conn, option_tickers, "PX_SETTLE", date, date, "DAILY")
+        
         for ticker in option_tickers:
-            df = fetch_historical_data(conn, ticker, "PX_SETTLE", date, date, "DAILY")
+            df = settlements[ticker]
             
             if not df.empty:
                 parts = ticker.split()
@@ -93,7 +117,31 @@ def get_option_settlements(option_tickers: List[str], date: str) -> pd.DataFrame
                 data['STRIKE'].append(strike)
                 data['SETTLEMENT'].append(settlement)
         
-        return pd.DataFrame(data)
+        expiry = None
+        if option_tickers:
+            series = option_tickers[0].split()[0][:-1]
+            expiry = _OPTION_EXPIRY_CACHE.get(series)
+            if expiry is None:
+                exp_df = fetch_reference_data(conn, [option_tickers[0]], ["OPT_EXPIRE_DT"])
+                expiry = _to_date(exp_df.iloc[0]["OPT_EXPIRE_DT"])
+                _OPTION_EXPIRY_CACHE[series] = expiry
+        
+        opt_df = pd.DataFrame(data)
+        opt_df.attrs['opt_expire_dt'] = expiry
+        return opt_df
+
+
+def _to_date(expiry_raw: Any) -> dt_date:
+    # Gestione robusta del tipo restituito
+    if isinstance(expiry_raw, datetime):
+        return expiry_raw.date()
+    elif isinstance(expiry_raw, dt_date):
+        return expiry_raw
+    elif isinstance(expiry_raw, pd.Timestamp):
+        return expiry_raw.date()
+    else:
+        # fallback: prova a parseare come stringa ISO
+        return datetime.strptime(str(expiry_raw), "%Y-%m-%d").date()
 
 
 def get_discount_curve(currency: str, date: str) -> pd.DataFrame:
@@ -103,7 +151,7 @@ def get_discount_curve(currency: str, date: str) -> pd.DataFrame:
     
     curve_tickers = DISCOUNT_CURVE_MAPPING[currency]
     
-    with BloombergConnection(BBG_HOST, BBG_PORT) as conn:
+    with shared_connection(BBG_HOST, BBG_PORT) as conn:
         data = {
             'CODE': [],
             'RATE': [],
@@ -111,19 +159,20 @@ def get_discount_curve(currency: str, date: str) -> pd.DataFrame:
             'DTE': []
         }
         
-        date_obj = datetime.strptime(date, "%Y%m%d").date()
+        date_obj = parse_yyyymmdd(date)
+        dtes = curve_dtes(currency, date_obj)
+        
+        rates = fetch_historical_data_multi(conn, list(curve_tickers), "PX_LAST", date, date, "DAILY")
         
-        for ticker in curve_tickers:
-            df = fetch_historical_data(conn, ticker, "PX_LAST", date, date, "DAILY")
+        for ticker, dte in zip(curve_tickers, dtes.tolist()):
+            df = rates[ticker]
             
             if not df.empty:
                 rate = float(df.iloc[0]["PX_LAST"])
-                tenor_date = get_rate_tenor(currency, ticker, date_obj)
-                dte = (tenor_date - date_obj).days
                 
                 data['CODE'].append(ticker)
                 data['RATE'].append(rate)
-                data['TENOR'].append(tenor_date)
+                data['TENOR'].append(date_obj + timedelta(days=dte))
                 data['DTE'].append(dte)
         
         return pd.DataFrame(data)
\ No newline at end of file
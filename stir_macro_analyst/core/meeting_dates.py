@@ -4,14 +4,20 @@
 
 import os
 import logging
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
 from pathlib import Path
+from ..infra import get_disk_cache
+from .rates_engine import parse_yyyymmdd
 
 
 logger = logging.getLogger(__name__)
 
+# Parsed, date-sorted meetings per currency: {currency: (csv_mtime, DataFrame)}
+_MEETINGS_CACHE: Dict[str, Tuple[float, pd.DataFrame]] = {}
+
 # Mapping currency to CSV file
 MEETING_FILES = {
     "USD": {
@@ -58,9 +64,7 @@ def count_meetings_in_range(
             f"Supported currencies: {', '.join(MEETING_FILES.keys())}"
         )
     
-    meeting_info = MEETING_FILES[currency]
-    PROJECT_ROOT = Path(__file__).resolve().parents[1]
-    csv_path = PROJECT_ROOT / meeting_info["file"]
+    csv_path = _meeting_file_path(currency)
     
     # Check if file exists
     if not os.path.exists(csv_path):
@@ -69,10 +73,41 @@ def count_meetings_in_range(
             f"Please ensure the CSV file exists with meeting dates."
         )
     
+    # The CSV mtime is part of the cache key so edits to the file invalidate it
+    result = _count_meetings_cached(
+        currency, start_date, end_date, os.path.getmtime(csv_path)
+    )
+    
+    # Callers add keys to the result: hand out a copy of the cached dict
+    return {**result, "meetings": list(result["meetings"])}
+
+
+def _meeting_file_path(currency: str) -> Path:
+    PROJECT_ROOT = Path(__file__).resolve().parents[1]
+    return PROJECT_ROOT / MEETING_FILES[currency]["file"]
+
+
+@lru_cache(maxsize=256)
+def _count_meetings_cached(
+    currency: str,
+    start_date: str,
+    end_date: str,
+    csv_mtime: float
+) -> Dict[str, Any]:
+    # Past schedules never change and the mtime is in the key: no expiry on disk
+    disk_key = ("meetings", currency, start_date, end_date, csv_mtime)
+    disk_cache = get_disk_cache()
+    cached_result = disk_cache.get(disk_key)
+    if cached_result is not None:
+        return cached_result
+    
+    meeting_info = MEETING_FILES[currency]
+    csv_path = _meeting_file_path(currency)
+    
     # Parse dates
     try:
-        start_dt = datetime.strptime(start_date, "%Y%m%d")
-        end_dt = datetime.strptime(end_date, "%Y%m%d")
+        start_dt = parse_yyyymmdd(start_date)
+        end_dt = parse_yyyymmdd(end_date)
     except ValueError as e:
         raise ValueError(
             f"Invalid date format. Expected YYYYMMDD, got start={start_date}, end={end_date}. "
@@ -85,6 +120,94 @@ def count_meetings_in_range(
             f"Start date ({start_date}) must be before or equal to end date ({end_date})"
         )
     
+    df = _load_meetings(currency, csv_path, csv_mtime)
+    
+    # Filter meetings in range: binary search on the sorted int64 nanoseconds
+    dates_ns = df['date'].values.astype('datetime64[ns]').view('i8')
+    lo = np.searchsorted(dates_ns, np.datetime64(start_dt, 'ns').view('i8'), side='left')
+    hi = np.searchsorted(dates_ns, np.datetime64(end_dt, 'ns').view('i8'), side='right')
+    meetings_in_range = df.iloc[lo:hi]
+    
+    num_meetings = len(meetings_in_range)
+    
+    # Format meeting dates for output
+    meeting_dates = [
+        dt.strftime("%Y-%m-%d") for dt in meetings_in_range['date']
+    ]
+    
+    logger.info(
+        f"Found {num_meetings} {meeting_info['meeting_type']} meetings "
+        f"between {start_date} and {end_date}"
+    )
+    
+    result = {
+        "currency": currency,
+        "start_date": start_date,
+        "end_date": end_date,
+        "num_meetings": num_meetings,
+        "central_bank": meeting_info["central_bank"],
+        "meeting_type": meeting_info["meeting_type"],
+        "meetings": meeting_dates
+    }
+    
+    disk_cache.set(disk_key, result)
+    return result
+
+
+def _load_meetings(currency: str, csv_path: Path, csv_mtime: float) -> pd.DataFrame:
+    """
+    Returns the meeting dates of a currency, parsed and sorted.
+    
+    Kept in memory per CSV mtime. On a cold start a sibling .feather file written
+    from the same CSV (by build_meeting_feathers at deploy time, or by the first
+    parse) is read instead of re-parsing it.
+    """
+    cached = _MEETINGS_CACHE.get(currency)
+    if cached is not None and cached[0] == csv_mtime:
+        return cached[1]
+    
+    feather_path = _feather_path(csv_path)
+    if feather_path.exists() and feather_path.stat().st_mtime >= csv_mtime:
+        try:
+            df = pd.read_feather(feather_path, columns=['date'])
+            _MEETINGS_CACHE[currency] = (csv_mtime, df)
+            return df
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {feather_path}: {e}")
+    
+    df = _parse_meetings_csv(csv_path)
+    
+    try:
+        df.to_feather(feather_path)
+    except Exception as e:
+        # Read-only data directory or pyarrow missing: the in-memory cache still applies
+        logger.debug(f"Could not write {feather_path}: {e}")
+    
+    _MEETINGS_CACHE[currency] = (csv_mtime, df)
+    return df
+
+
+def _feather_path(csv_path: Path) -> Path:
+    return csv_path.with_name(csv_path.name + ".feather")
+
+
+def build_meeting_feathers() -> List[Path]:
+    """
+    Writes the .feather sibling of every meeting CSV, already parsed to datetime64.
+    
+    Run at build/deploy time (python -m stir_macro_analyst.core.meeting_dates) so
+    that workers with a read-only data directory never parse the CSVs.
+    """
+    written = []
+    for currency in MEETING_FILES:
+        csv_path = _meeting_file_path(currency)
+        feather_path = _feather_path(csv_path)
+        _parse_meetings_csv(csv_path).to_feather(feather_path)
+        written.append(feather_path)
+    return written
+
+
+def _parse_meetings_csv(csv_path: Path) -> pd.DataFrame:
     # Read CSV
     try:
         df = pd.read_csv(csv_path)
@@ -103,35 +226,16 @@ def count_meetings_in_range(
     
     # Parse meeting dates
     try:
-        df['date'] = pd.to_datetime(df['date'])
+        dates = pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True)
     except Exception as e:
         raise ValueError(
             f"Error parsing dates in {csv_path}: {e}. "
             f"Expected date format: YYYY-MM-DD"
         )
     
-    # Filter meetings in range
-    mask = (df['date'] >= start_dt) & (df['date'] <= end_dt)
-    meetings_in_range = df[mask].sort_values('date')
-    
-    num_meetings = len(meetings_in_range)
-    
-    # Format meeting dates for output
-    meeting_dates = [
-        dt.strftime("%Y-%m-%d") for dt in meetings_in_range['date']
-    ]
-    
-    logger.info(
-        f"Found {num_meetings} {meeting_info['meeting_type']} meetings "
-        f"between {start_date} and {end_date}"
-    )
-    
-    return {
-        "currency": currency,
-        "start_date": start_date,
-        "end_date": end_date,
-        "num_meetings": num_meetings,
-        "central_bank": meeting_info["central_bank"],
-        "meeting_type": meeting_info["meeting_type"],
-        "meetings": meeting_dates
-    }
\ No newline at end of file
+    return pd.DataFrame({'date': dates}).sort_values('date').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    for path in build_meeting_feathers():
+        print(f"Wrote {path}")
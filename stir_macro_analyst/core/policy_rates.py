@@ -6,20 +6,30 @@ logger = logging.getLogger(__name__)
 
 """Policy rate retrieval logic."""
 
+import threading
 from typing import Dict, Any
+from cachetools import TTLCache, cached
 from ..infra import (
-    BloombergConnection,
+    shared_connection,
     fetch_historical_data,
     POLICY_RATE_MAPPING,
     BBG_HOST,
-    BBG_PORT
+    BBG_PORT,
+    get_disk_cache
 )
 
+# Policy rates change at most a few times per month: keep lookups for 1 hour
+POLICY_RATE_CACHE_TTL = 3600
+_policy_rate_cache: TTLCache = TTLCache(maxsize=32, ttl=POLICY_RATE_CACHE_TTL)
+
 
 def get_policy_rate_for_currency(currency: str, date: str) -> Dict[str, Any]:
     """
     Retrieves policy rate for a currency on a specific date.
     
+    Results are cached per (currency, date) for POLICY_RATE_CACHE_TTL seconds,
+    in memory and on disk (shared by all workers using the same STIR_CACHE_DIR).
+    
     Args:
         currency: USD, EUR, or GBP
         date: Date in YYYYMMDD format
@@ -27,13 +37,25 @@ def get_policy_rate_for_currency(currency: str, date: str) -> Dict[str, Any]:
     Returns:
         Dict with rate value and metadata
     """
+    # Callers add keys to the result: hand out a copy of the cached dict
+    return dict(_fetch_policy_rate(currency, date))
+
+
+@cached(_policy_rate_cache, lock=threading.Lock())
+def _fetch_policy_rate(currency: str, date: str) -> Dict[str, Any]:
     if currency not in POLICY_RATE_MAPPING:
         raise ValueError(f"Unsupported currency: {currency}")
     
+    disk_key = ("policy_rate", currency, date)
+    disk_cache = get_disk_cache()
+    cached_result = disk_cache.get(disk_key)
+    if cached_result is not None:
+        return cached_result
+    
     rate_info = POLICY_RATE_MAPPING[currency]
     logger.info(f"In policy_rates: Retrieving policy rate for {rate_info} on {date}")
 
-    with BloombergConnection(BBG_HOST, BBG_PORT) as conn:
+    with shared_connection(BBG_HOST, BBG_PORT) as conn:
         df = fetch_historical_data(
             conn,
             rate_info["ticker"],
@@ -45,11 +67,14 @@ def get_policy_rate_for_currency(currency: str, date: str) -> Dict[str, Any]:
     if df.empty or df.iloc[0]["PX_LAST"] is None:
         raise ValueError(f"No policy rate data for {currency} on {date}")
     
-    return {
+    result = {
         "currency": currency,
         "date": date,
         "policy_rate": float(df.iloc[0]["PX_LAST"]),
         "ticker": rate_info["ticker"],
         "rate_name": rate_info["name"],
         "central_bank": rate_info["central_bank"]
-    }
\ No newline at end of file
+    }
+    
+    disk_cache.set(disk_key, result, expire=POLICY_RATE_CACHE_TTL)
+    return result
\ No newline at end of file
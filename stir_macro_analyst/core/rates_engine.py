@@ -1,24 +1,37 @@
 # core/rates_engine.py
 
-from datetime import datetime, date
+import re
+import threading
+from datetime import date
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
 import holidays
+import numpy as np
 import pandas as pd
-from scipy.interpolate import CubicSpline
-from typing import Union, Tuple
+from cachetools import LRUCache
+from typing import FrozenSet, Union, Tuple
+from ..infra import DISCOUNT_CURVE_MAPPING
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def parse_yyyymmdd(value: str) -> date:
+    """Parses a YYYYMMDD string by slicing; raises ValueError like strptime does."""
+    if len(value) != 8 or not value.isdigit():
+        raise ValueError(f"time data {value!r} does not match format '%Y%m%d'")
+    return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+
 def calculate_time_to_expiry(
     start_date: Union[str, date], 
     expiry_date: Union[str, date]
 ) -> Tuple[int, float]:
     if isinstance(start_date, str):
-        start_date = datetime.strptime(start_date, "%Y%m%d").date()
+        start_date = parse_yyyymmdd(start_date)
     if isinstance(expiry_date, str):
-        expiry_date = datetime.strptime(expiry_date, "%Y%m%d").date()
+        expiry_date = parse_yyyymmdd(expiry_date)
     
     delta = expiry_date - start_date
     days = delta.days
@@ -27,72 +40,110 @@ def calculate_time_to_expiry(
     return days, years
 
 
-def interpolate_discount_rate(curve_df: pd.DataFrame, target_dte: int) -> float:
+# Cleaned curve nodes, keyed by the raw DTE/RATE values
+_CURVE_CACHE: LRUCache = LRUCache(maxsize=64)
+_curve_cache_lock = threading.Lock()
+
+
+def interpolate_discount_rate(
+    curve_df: pd.DataFrame,
+    target_dte: int,
+    clean: bool = True
+) -> float:
+    """
+    Discount rate at target_dte, linear between curve nodes and flat beyond them.
+    
+    With clean=False the caller guarantees numeric, NaN-free, positive and strictly
+    increasing DTEs (as get_discount_curve returns), and the nodes are used as-is.
+    """
     if 'DTE' not in curve_df.columns or 'RATE' not in curve_df.columns:
         raise ValueError("curve_df must contain 'DTE' and 'RATE' columns")
 
-    # Pulisci i dati
-    df = curve_df.copy()
+    if clean:
+        x, y = _curve_nodes(curve_df)
+    else:
+        x = curve_df['DTE'].to_numpy(dtype=float)
+        y = curve_df['RATE'].to_numpy(dtype=float)
+        if len(x) < 2:
+            raise ValueError(f"Not enough points to build curve: {len(x)} rows")
 
-    # Tieni solo righe con DTE e RATE validi
-    df = df.dropna(subset=['DTE', 'RATE'])
+    # Lineare tra i nodi; fuori range np.interp clampa ai bordi
+    return float(np.interp(target_dte, x, y))
 
-    # Converte in numerico (se arrivano come stringhe)
-    df['DTE'] = pd.to_numeric(df['DTE'], errors='coerce')
-    df['RATE'] = pd.to_numeric(df['RATE'], errors='coerce')
-    df = df.dropna(subset=['DTE', 'RATE'])
 
-    # Tieni solo DTE strettamente positivi (o >=0 se vuoi includere oggi)
-    df = df[df['DTE'] > 0]
+def _curve_nodes(curve_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Cleaned (DTE, RATE) nodes, strictly increasing in DTE, built once per distinct curve."""
+    # Plain value tuples: cheaper than hashing a column subset, and valid for object columns
+    key = (tuple(curve_df['DTE'].tolist()), tuple(curve_df['RATE'].tolist()))
 
-    # Aggrega eventuali duplicati sulla stessa DTE (media dei RATE o first, scegli tu)
-    df = (
-        df.groupby('DTE', as_index=False)['RATE']
-        .mean()             # puoi usare .first() se preferisci
-        .sort_values('DTE')
-    )
+    with _curve_cache_lock:
+        cached = _CURVE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    entry = _clean_curve(curve_df)
+    with _curve_cache_lock:
+        _CURVE_CACHE[key] = entry
+    return entry
 
-    # Serve almeno 2 punti per una spline sensata
-    if len(df) < 2:
-        raise ValueError(f"Not enough points to build curve after cleaning: {len(df)} rows")
 
-    # Boundaries: se target fuori range, clamp ai bordi
-    dte_min = df['DTE'].min()
-    dte_max = df['DTE'].max()
+def _clean_curve(curve_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    # Converte in numerico (se arrivano come stringhe); None e valori invalidi -> NaN
+    x = pd.to_numeric(curve_df['DTE'], errors='coerce').to_numpy(dtype=float)
+    y = pd.to_numeric(curve_df['RATE'], errors='coerce').to_numpy(dtype=float)
 
-    if target_dte <= dte_min:
-        return float(df.iloc[0]['RATE'])
-    if target_dte >= dte_max:
-        return float(df.iloc[-1]['RATE'])
+    # Tieni solo righe con DTE e RATE validi e DTE strettamente positivi
+    keep = ~np.isnan(x) & ~np.isnan(y) & (x > 0)
+    x = x[keep]
+    y = y[keep]
 
-    logger.info("Siamo in interpolate_discount_rate (clean curve)")
-    x = df['DTE'].values
-    y = df['RATE'].values
+    # Aggrega eventuali duplicati sulla stessa DTE (media dei RATE); np.unique ordina per DTE
+    x, inverse = np.unique(x, return_inverse=True)
+    y = np.bincount(inverse, weights=y) / np.bincount(inverse)
 
-    # Ora x è strettamente crescente e senza duplicati
-    spl = CubicSpline(x, y)
+    # Serve almeno 2 punti per interpolare
+    if len(x) < 2:
+        raise ValueError(f"Not enough points to build curve after cleaning: {len(x)} rows")
 
-    return float(spl(target_dte))
+    return x, y
 
 
+# Years of holidays materialized from the start year: covers the longest curve tenor (3Y)
+HOLIDAY_WINDOW_YEARS = 5
+
+
+@lru_cache(maxsize=32)
+def _holiday_dates(country_code: str, start_year: int) -> FrozenSet[date]:
+    """Holiday dates of a country for start_year .. start_year + HOLIDAY_WINDOW_YEARS - 1."""
+    country_holidays = holidays.country_holidays(
+        country_code,
+        years=range(start_year, start_year + HOLIDAY_WINDOW_YEARS)
+    )
+    return frozenset(country_holidays.keys())
+
+
+@lru_cache(maxsize=32)
+def _business_calendar(country_code: str, start_year: int) -> np.busdaycalendar:
+    """Mon-Fri calendar without the holidays of _holiday_dates (same window)."""
+    return np.busdaycalendar(
+        holidays=np.array(sorted(_holiday_dates(country_code, start_year)), dtype='datetime64[D]')
+    )
+
+
+def _roll_forward(d: date, calendar: np.busdaycalendar) -> date:
+    """Next business day on or after d (weekends and holidays skipped in C)."""
+    return np.busday_offset(np.datetime64(d, 'D'), 0, roll='forward', busdaycal=calendar).astype(date)
+
 
 def add_months_and_ensure_business_day(
     start_date: date, 
     months: int, 
     country_code: str
 ) -> date:
-    country_holidays = holidays.country_holidays(country_code)
+    calendar = _business_calendar(country_code, start_date.year)
     new_date = start_date + relativedelta(months=months)
     
-    while new_date.weekday() >= 5 or new_date in country_holidays:
-        if new_date.weekday() == 5:
-            new_date += relativedelta(days=2)
-        elif new_date.weekday() == 6:
-            new_date += relativedelta(days=1)
-        else:
-            new_date += relativedelta(days=1)
-    
-    return new_date
+    return _roll_forward(new_date, calendar)
 
 
 def add_weeks_and_ensure_business_day(
@@ -100,41 +151,60 @@ def add_weeks_and_ensure_business_day(
     weeks: int, 
     country_code: str
 ) -> date:
-    country_holidays = holidays.country_holidays(country_code)
+    calendar = _business_calendar(country_code, start_date.year)
     new_date = start_date + relativedelta(weeks=weeks)
     
-    while new_date.weekday() >= 5 or new_date in country_holidays:
-        if new_date.weekday() == 5:
-            new_date += relativedelta(days=2)
-        elif new_date.weekday() == 6:
-            new_date += relativedelta(days=1)
-        else:
-            new_date += relativedelta(days=1)
-    
-    return new_date
+    return _roll_forward(new_date, calendar)
+
+
+_COUNTRY_MAP = {"USD": "US", "EUR": "DE", "GBP": "GB"}
+
+# Curve ticker suffix (after the USOSFR/EESWE/BPSWS root) -> tenor
+_TENOR_MAP = {
+    "1Z": ("weeks", 1), "2Z": ("weeks", 2), "3Z": ("weeks", 3),
+    "A": ("months", 1), "B": ("months", 2), "C": ("months", 3),
+    "D": ("months", 4), "E": ("months", 5), "F": ("months", 6),
+    "G": ("months", 7), "H": ("months", 8), "I": ("months", 9),
+    "J": ("months", 10), "K": ("months", 11), "1": ("months", 12),
+    "1F": ("months", 18), "2": ("months", 24), "3": ("months", 36)
+}
 
+_TENOR_RE = re.compile(r'^(?:USOSFR|EESWE|BPSWS)(\w+)\s+BGN\s+CURNCY$')
 
+
+# Pure in its arguments: the same curve ticker on the same date always rolls to the same date
+@lru_cache(maxsize=1024)
 def get_rate_tenor(ccy: str, curve_ticker: str, date_ref: date) -> date:
-    country_map = {"USD": "US", "EUR": "DE", "GBP": "GB"}
-    country = country_map.get(ccy)
+    country = _COUNTRY_MAP.get(ccy)
     
     if not country:
         raise ValueError(f"Unsupported currency: {ccy}")
     
-    tenor_map = {
-        "1Z": ("weeks", 1), "2Z": ("weeks", 2), "3Z": ("weeks", 3),
-        "A": ("months", 1), "B": ("months", 2), "C": ("months", 3),
-        "D": ("months", 4), "E": ("months", 5), "F": ("months", 6),
-        "G": ("months", 7), "H": ("months", 8), "I": ("months", 9),
-        "J": ("months", 10), "K": ("months", 11), "1": ("months", 12),
-        "1F": ("months", 18), "2": ("months", 24), "3": ("months", 36)
-    }
+    m = _TENOR_RE.match(curve_ticker)
+    tenor = _TENOR_MAP.get(m.group(1)) if m else None
+    
+    if tenor is None:
+        raise ValueError(f"Cannot parse tenor from {curve_ticker}")
     
-    for suffix, (period_type, period_value) in tenor_map.items():
-        if curve_ticker.endswith(f"{suffix} BGN CURNCY"):
-            if period_type == "weeks":
-                return add_weeks_and_ensure_business_day(date_ref, period_value, country)
-            else:
-                return add_months_and_ensure_business_day(date_ref, period_value, country)
+    period_type, period_value = tenor
+    if period_type == "weeks":
+        return add_weeks_and_ensure_business_day(date_ref, period_value, country)
+    return add_months_and_ensure_business_day(date_ref, period_value, country)
+
+
+@lru_cache(maxsize=512)
+def curve_dtes(ccy: str, date_ref: date) -> np.ndarray:
+    """
+    Days from date_ref to each DISCOUNT_CURVE_MAPPING[ccy] tenor, in mapping order.
     
-    raise ValueError(f"Cannot parse tenor from {curve_ticker}")
\ No newline at end of file
+    Rolled once per (currency, date); the cached array is read-only.
+    """
+    if ccy not in DISCOUNT_CURVE_MAPPING:
+        raise ValueError(f"Unsupported currency: {ccy}")
+    
+    dtes = np.array(
+        [(get_rate_tenor(ccy, ticker, date_ref) - date_ref).days for ticker in DISCOUNT_CURVE_MAPPING[ccy]],
+        dtype=np.int64
+    )
+    dtes.flags.writeable = False
+    return dtes
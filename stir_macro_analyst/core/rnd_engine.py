@@ -1,45 +1,106 @@
 # core/rnd_engine.py
 
+import math
 import numpy as np
-from pysabr import Hagan2002LognormalSABR, black
+from numba import njit, prange
+from pysabr import Hagan2002LognormalSABR
 from typing import Tuple
-from .sabr_calibration import SABRParameters
+from .sabr_calibration import SABRParameters, hagan_lognormal_vol
+
+
+# Default number of strikes in the RND grid
+RND_GRID_POINTS = 500
 
 
 def generate_rnd(
     sabr_params: SABRParameters,
     min_strike: float,
     max_strike: float,
-    grid_points: int = 500
+    grid_points: int = RND_GRID_POINTS
 ) -> Tuple[np.ndarray, np.ndarray]:
     
     strikes = np.linspace(min_strike, max_strike, grid_points)
+    return strikes, generate_rnd_on_grid(sabr_params, strikes)
+
+
+def generate_rnd_on_grid(sabr_params: SABRParameters, strikes: np.ndarray) -> np.ndarray:
+    """Density at the given price-space strikes, in any order (each strike is independent)."""
+    # Alpha is implied once from the ATM normal vol (a cubic root solve), not per strike
+    alpha = Hagan2002LognormalSABR(
+        f=sabr_params.forward,
+        shift=0,
+        t=sabr_params.tau,
+        v_atm_n=sabr_params.atm_vol,
+        beta=sabr_params.beta,
+        rho=sabr_params.rho,
+        volvol=sabr_params.volvol
+    ).alpha()
     
-    bs_calls = []
-    for strike in strikes:
-        vola = Hagan2002LognormalSABR(
-            f=sabr_params.forward,
-            shift=0,
-            t=sabr_params.tau,
-            v_atm_n=sabr_params.atm_vol,
-            beta=sabr_params.beta,
-            rho=sabr_params.rho,
-            volvol=sabr_params.volvol
-        ).lognormal_vol(strike)
-        
-        call_price = black.lognormal_call(
-            k=strike,
-            f=sabr_params.forward,
-            t=sabr_params.tau,
-            v=vola,
-            r=sabr_params.rfr,
-            cp='call'
-        )
-        bs_calls.append(call_price)
+    return _sabr_rnd(
+        np.ascontiguousarray(strikes, dtype=np.float64),
+        sabr_params.forward,
+        sabr_params.tau,
+        alpha,
+        sabr_params.beta,
+        sabr_params.rho,
+        sabr_params.volvol,
+        _LOG_STRIKE_BUMP
+    )
+
+
+# Log-strike bump for the smile slope and curvature in _sabr_rnd
+_LOG_STRIKE_BUMP = 1e-4
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _sabr_rnd(
+    strikes: np.ndarray,
+    forward: float,
+    tau: float,
+    alpha: float,
+    beta: float,
+    rho: float,
+    volvol: float,
+    h: float
+) -> np.ndarray:
+    """
+    Breeden-Litzenberger density e^(rT) * d2C/dK2 in closed form, smile included.
     
-    first_grad = np.gradient(bs_calls, strikes)
-    second_grad = np.gradient(first_grad, strikes)
+    With y = ln(K/F) and total variance w(y) = vol^2 * T (Gatheral):
+        density = g(y) * phi(d2) / (K * sqrt(w)),  d2 = -y/sqrt(w) - sqrt(w)/2
+        g(y) = (1 - y*w'/(2w))^2 - w'^2/4 * (1/4 + 1/w) + w''/2
+    The flat-smile case is g = 1. w' and w'' come from the SABR vols at K*e^(+-h).
+    Discounting cancels, so no exp(rT) factor and no finite differences of prices.
     
-    rnd = second_grad * np.exp(sabr_params.tau * sabr_params.rfr)
+    Numba kernel: the three SABR vols and the density of each strike are computed
+    in the same parallel pass, with no intermediate arrays. 0 where a vol is not positive.
+    """
+    n = strikes.shape[0]
+    rnd = np.zeros(n)
+    if forward <= 0 or tau <= 0:
+        return rnd
     
-    return strikes, rnd
\ No newline at end of file
+    inv_sqrt_2pi = 1.0 / math.sqrt(2 * math.pi)
+    up = math.exp(h)
+    for i in prange(n):
+        k = strikes[i]
+        vol = hagan_lognormal_vol(k, forward, tau, alpha, beta, rho, volvol)
+        vol_up = hagan_lognormal_vol(k * up, forward, tau, alpha, beta, rho, volvol)
+        vol_down = hagan_lognormal_vol(k / up, forward, tau, alpha, beta, rho, volvol)
+        if k <= 0 or vol <= 0 or vol_up <= 0 or vol_down <= 0:
+            continue
+        
+        w = vol * vol * tau
+        w_up = vol_up * vol_up * tau
+        w_down = vol_down * vol_down * tau
+        dw = (w_up - w_down) / (2 * h)
+        d2w = (w_up - 2 * w + w_down) / (h * h)
+        
+        y = math.log(k / forward)
+        sqrt_w = math.sqrt(w)
+        d2 = -y / sqrt_w - sqrt_w / 2
+        slope = 1 - y * dw / (2 * w)
+        g = slope * slope - dw * dw / 4 * (0.25 + 1 / w) + d2w / 2
+        
+        rnd[i] = g * math.exp(-0.5 * d2 * d2) * inv_sqrt_2pi / (k * sqrt_w)
+    return rnd
@@ -1,15 +1,26 @@
 # core/sabr_calibration.py
 
+import math
+import os
+import numba
 import numpy as np
+from numba import njit, prange
 from py_vollib.black.implied_volatility import implied_volatility
-from pysabr import Hagan2002LognormalSABR
+from scipy.optimize import least_squares
 from pysabr import black
-from scipy.interpolate import CubicSpline
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple, Union
 
+# The parallel kernels here and in rnd_engine run on worker threads (asyncio.to_thread,
+# the pair executor). After such launches the TBB layer, numba's first default choice,
+# can hang interpreter shutdown, and workqueue is not safe for concurrent launches, so
+# OpenMP is preferred. Read by numba at the first parallel launch; the
+# NUMBA_THREADING_LAYER(_PRIORITY) environment variables still take precedence.
+if not {"NUMBA_THREADING_LAYER", "NUMBA_THREADING_LAYER_PRIORITY"} & os.environ.keys():
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SABRParameters:
     alpha: float
     rho: float
@@ -21,6 +32,62 @@ class SABRParameters:
     forward: float
 
 
+@njit(fastmath=True, cache=True)
+def hagan_lognormal_vol(
+    k: float,
+    forward: float,
+    tau: float,
+    alpha: float,
+    beta: float,
+    rho: float,
+    volvol: float
+) -> float:
+    """
+    Hagan's 2002 SABR lognormal vol expansion, compiled with Numba.
+    
+    Same algebra as pysabr's lognormal_vol (0 vol for non-positive strike or
+    forward, small-z limit below 1e-7), callable from other Numba kernels.
+    """
+    if k <= 0 or forward <= 0:
+        return 0.0
+    
+    eps = 1e-07
+    logfk = math.log(forward / k)
+    fkbeta = (forward * k) ** (1 - beta)
+    a = (1 - beta) ** 2 * alpha ** 2 / (24 * fkbeta)
+    b = 0.25 * rho * beta * volvol * alpha / math.sqrt(fkbeta)
+    c = (2 - 3 * rho ** 2) * volvol ** 2 / 24
+    d = math.sqrt(fkbeta)
+    v = (1 - beta) ** 2 * logfk ** 2 / 24
+    w = (1 - beta) ** 4 * logfk ** 4 / 1920
+    z = volvol * math.sqrt(fkbeta) * logfk / alpha
+    
+    # z / x(z) -> 1 as z -> 0
+    if abs(z) <= eps:
+        z_over_x = 1.0
+    else:
+        z_over_x = z / math.log((math.sqrt(1 - 2 * rho * z + z ** 2) + z - rho) / (1 - rho))
+    
+    return alpha * (1 + (a + b + c) * tau) / (d * (1 + v + w)) * z_over_x
+
+
+@njit(fastmath=True, cache=True)
+def _hagan_lognormal_smile(
+    strikes: np.ndarray,
+    forward: float,
+    tau: float,
+    alpha: float,
+    beta: float,
+    rho: float,
+    volvol: float
+) -> np.ndarray:
+    """hagan_lognormal_vol across a strike array."""
+    vols = np.empty(strikes.shape[0])
+    for i in range(strikes.shape[0]):
+        vols[i] = hagan_lognormal_vol(strikes[i], forward, tau, alpha, beta, rho, volvol)
+    return vols
+
+
 def calculate_implied_vol(
     option_price: float,
     underlying_price: float,
@@ -38,27 +105,214 @@ def calculate_implied_vol(
         return 0.0
 
 
+def calculate_implied_vol_vec(
+    option_prices: np.ndarray,
+    underlying_price: float,
+    strikes: np.ndarray,
+    tau: float,
+    rfr: float,
+    option_types: np.ndarray
+) -> np.ndarray:
+    """
+    calculate_implied_vol over a whole option chain in one Numba pass.
+    
+    Same conventions: discounted Black-76 prices, vols in percent,
+    0.0 where no vol reproduces the price (outside the no-arbitrage bounds).
+    """
+    is_call = np.asarray(option_types) == 'call'
+    return _black_implied_vols(
+        np.asarray(option_prices, dtype=np.float64),
+        float(underlying_price),
+        np.asarray(strikes, dtype=np.float64),
+        float(tau),
+        float(rfr),
+        is_call
+    ) * 100
+
+
+# Vol bracket and tolerances for _black_implied_vols
+_IV_MIN = 1e-6
+_IV_MAX = 10.0
+_IV_TOL = 1e-12
+_IV_MAX_ITER = 100
+
+
+@njit(cache=True)
+def _norm_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+@njit(cache=True)
+def _black_undiscounted(f: float, k: float, tau: float, vol: float, is_call: bool) -> float:
+    sd = vol * math.sqrt(tau)
+    d1 = math.log(f / k) / sd + 0.5 * sd
+    d2 = d1 - sd
+    if is_call:
+        return f * _norm_cdf(d1) - k * _norm_cdf(d2)
+    return k * _norm_cdf(-d2) - f * _norm_cdf(-d1)
+
+
+@njit(parallel=True, cache=True)
+def _black_implied_vols(
+    prices: np.ndarray,
+    f: float,
+    strikes: np.ndarray,
+    tau: float,
+    rfr: float,
+    is_call: np.ndarray
+) -> np.ndarray:
+    """
+    Black-76 implied vols by Newton-Raphson on vega, safeguarded by bisection.
+    
+    Each option keeps a [lo, hi] bracket of the root; a Newton step that leaves it
+    is replaced by the midpoint, so every strike converges from the same start.
+    """
+    n = prices.shape[0]
+    vols = np.zeros(n)
+    if f <= 0 or tau <= 0:
+        return vols
+    
+    sqrt_tau = math.sqrt(tau)
+    discount = math.exp(rfr * tau)
+    for i in prange(n):
+        k = strikes[i]
+        target = prices[i] * discount
+        if k <= 0:
+            continue
+        intrinsic = max(f - k, 0.0) if is_call[i] else max(k - f, 0.0)
+        upper = f if is_call[i] else k
+        if target <= intrinsic or target >= upper:
+            continue
+        
+        lo = _IV_MIN
+        hi = _IV_MAX
+        if _black_undiscounted(f, k, tau, hi, is_call[i]) < target:
+            continue
+        
+        # Brenner-Subrahmanyam initial guess
+        vol = min(max(math.sqrt(2 * math.pi / tau) * target / f, lo), hi)
+        for _ in range(_IV_MAX_ITER):
+            diff = _black_undiscounted(f, k, tau, vol, is_call[i]) - target
+            if abs(diff) <= _IV_TOL * max(target, 1e-300):
+                break
+            if diff > 0:
+                hi = vol
+            else:
+                lo = vol
+            
+            sd = vol * sqrt_tau
+            d1 = math.log(f / k) / sd + 0.5 * sd
+            vega = f * math.exp(-0.5 * d1 * d1) / math.sqrt(2 * math.pi) * sqrt_tau
+            step = vol - diff / vega if vega > 0 else -1.0
+            vol = step if lo < step < hi else 0.5 * (lo + hi)
+            if hi - lo <= _IV_TOL * vol:
+                break
+        
+        vols[i] = vol
+    return vols
+
+
+# Fit bounds on (rho, volvol), as in pysabr's Hagan2002LognormalSABR.fit
+_FIT_LOWER = (-0.9999, 0.0001)
+_FIT_UPPER = (0.9999, np.inf)
+_ALPHA_MIN = 0.0001
+
+
+@njit(fastmath=True, cache=True)
+def _alpha_from_atm(
+    atm_ln_vol: float,
+    forward: float,
+    tau: float,
+    beta: float,
+    rho: float,
+    volvol: float
+) -> float:
+    """
+    alpha reproducing the ATM lognormal vol for given (rho, volvol).
+    
+    Hagan's ATM expansion is a cubic in alpha. Newton from the first-order
+    guess sigma_ATM * F^(1-beta) lands on its smallest positive root, the
+    one QuantLib picks.
+    """
+    f_beta = forward ** (1 - beta)
+    c3 = (1 - beta) ** 2 * tau / (24 * f_beta ** 2)
+    c2 = rho * beta * volvol * tau / (4 * f_beta)
+    c1 = 1 + (2 - 3 * rho ** 2) * volvol ** 2 * tau / 24
+    c0 = -atm_ln_vol * f_beta
+    
+    alpha = atm_ln_vol * f_beta
+    for _ in range(50):
+        value = ((c3 * alpha + c2) * alpha + c1) * alpha + c0
+        slope = (3 * c3 * alpha + 2 * c2) * alpha + c1
+        if slope <= 0:
+            break
+        step = value / slope
+        alpha -= step
+        if abs(step) <= 1e-14 * abs(alpha):
+            break
+    
+    return max(alpha, _ALPHA_MIN)
+
+
+def _fit_sabr(
+    forward: float,
+    strikes: np.ndarray,
+    market_vols: np.ndarray,
+    tau: float,
+    beta: float,
+    atm_ln_vol: float
+) -> Tuple[float, float, float]:
+    """
+    Least-squares fit of (alpha, rho, volvol) to the smile (vols in percent).
+    
+    Only (rho, volvol) are optimized: alpha is pinned by the ATM vol at each
+    step. Residuals are weighted by the Black vega of each quote, so wings
+    with little price sensitivity weigh less, as in QuantLib's SABR fit.
+    """
+    strikes = np.ascontiguousarray(strikes, dtype=np.float64)
+    
+    sd = market_vols / 100 * np.sqrt(tau)
+    d1 = np.log(forward / strikes) / sd + 0.5 * sd
+    vega = np.exp(-0.5 * d1 ** 2)
+    weights = vega / vega.max()
+    
+    def residuals(x: np.ndarray) -> np.ndarray:
+        alpha = _alpha_from_atm(atm_ln_vol, forward, tau, beta, x[0], x[1])
+        smile = _hagan_lognormal_smile(strikes, forward, tau, alpha, beta, x[0], x[1])
+        return weights * (smile * 100 - market_vols)
+    
+    res = least_squares(residuals, np.array([0.0, 0.10]), bounds=(_FIT_LOWER, _FIT_UPPER), method='trf')
+    rho, volvol = res.x
+    alpha = _alpha_from_atm(atm_ln_vol, forward, tau, beta, rho, volvol)
+    return alpha, float(rho), float(volvol)
+
+
 def calibrate_sabr(
     forward: float,
-    strikes: List[float],
-    market_vols: List[float],
+    strikes: Union[List[float], np.ndarray],
+    market_vols: Union[List[float], np.ndarray],
     tau: float,
     rfr: float,
     beta: float = 0.5
 ) -> SABRParameters:
     
-    strikes_arr = np.array(strikes)
-    market_vols_arr = np.array(market_vols)
+    strikes_arr = np.asarray(strikes, dtype=np.float64)
+    market_vols_arr = np.asarray(market_vols, dtype=np.float64)
+    
+    # np.interp needs ascending strikes: callers may pass the smile in any order
+    if np.any(np.diff(strikes_arr) < 0):
+        order = np.argsort(strikes_arr, kind='stable')
+        strikes_arr = strikes_arr[order]
+        market_vols_arr = market_vols_arr[order]
     
-    spl = CubicSpline(strikes_arr, market_vols_arr)
-    atm_ln_vol = spl(forward) / 100
+    # Single ATM lookup: linear between the two bracketing strikes, no spline solve
+    atm_ln_vol = float(np.interp(forward, strikes_arr, market_vols_arr)) / 100
     
     atm_n_vol = black.shifted_lognormal_to_normal(
         forward, forward, 0.0, tau, atm_ln_vol
     )
     
-    sabr_model = Hagan2002LognormalSABR(f=forward, t=tau, beta=beta)
-    alpha, rho, volvol = sabr_model.fit(strikes_arr, market_vols_arr)
+    alpha, rho, volvol = _fit_sabr(forward, strikes_arr, market_vols_arr, tau, beta, atm_ln_vol)
     
     return SABRParameters(
         alpha=alpha,
@@ -69,4 +323,40 @@ def calibrate_sabr(
         tau=tau,
         rfr=rfr,
         forward=forward
-    )
\ No newline at end of file
+    )
+
+
+def calibrate_from_prices(
+    forward: float,
+    strikes: np.ndarray,
+    option_prices: np.ndarray,
+    option_types: np.ndarray,
+    tau: float,
+    rfr: float,
+    beta: float = 0.5,
+    min_options: int = 5
+) -> Tuple[SABRParameters, int]:
+    """
+    calibrate_sabr straight from option settlement prices.
+    
+    Implied vols are solved for the whole chain and the quotes without one are
+    masked out, all on numpy arrays. Returns the parameters and the number of
+    options used; raises ValueError when fewer than min_options have a vol.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    vols = calculate_implied_vol_vec(
+        np.asarray(option_prices, dtype=np.float64),
+        forward,
+        strikes,
+        tau,
+        rfr,
+        np.asarray(option_types)
+    )
+    valid = vols > 0
+    num_used = int(np.count_nonzero(valid))
+    
+    if num_used < min_options:
+        raise ValueError("Insufficient options after IV calculation")
+    
+    sabr_params = calibrate_sabr(forward, strikes[valid], vols[valid], tau, rfr, beta)
+    return sabr_params, num_used
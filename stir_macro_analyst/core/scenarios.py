@@ -1,10 +1,17 @@
 # core/scenarios.py
 
 import numpy as np
-from scipy import integrate
 from typing import Dict, Tuple
 
 
+def _cumulative_density(strikes: np.ndarray, density: np.ndarray) -> np.ndarray:
+    """Trapezoidal antiderivative of the density on its (ascending) strike grid."""
+    strikes = np.ascontiguousarray(strikes, dtype=np.float64)
+    density = np.ascontiguousarray(density, dtype=np.float64)
+    steps = 0.5 * (density[1:] + density[:-1]) * np.diff(strikes)
+    return np.concatenate(([0.0], np.cumsum(steps)))
+
+
 def integrate_rnd_over_range(
     strikes: np.ndarray,
     density: np.ndarray,
@@ -12,16 +19,11 @@ def integrate_rnd_over_range(
     max_rate: float
 ) -> float:
     
-    mask = (strikes >= min_rate) & (strikes <= max_rate)
-    filtered_strikes = strikes[mask]
-    filtered_density = density[mask]
-    
-    if len(filtered_strikes) > 1:
-        prob = integrate.simpson(filtered_density, x=filtered_strikes)
-    else:
-        prob = 0.0
+    strikes = np.ascontiguousarray(strikes, dtype=np.float64)
+    cdf = _cumulative_density(strikes, density)
+    lower, upper = np.interp((min_rate, max_rate), strikes, cdf)
     
-    return float(prob)
+    return float(upper - lower)
 
 
 def compute_scenario_probabilities(
@@ -30,24 +32,54 @@ def compute_scenario_probabilities(
     scenarios: Dict[str, Tuple[float, float]]
 ) -> Dict[str, float]:
     
-    probabilities = {}
+    if not scenarios:
+        return {}
     
-    for scenario_name, (min_rate, max_rate) in scenarios.items():
-        prob = integrate_rnd_over_range(strikes, density, min_rate, max_rate)
-        probabilities[scenario_name] = prob
+    # One cumulative integral for all scenarios, each band is a CDF difference
+    strikes = np.ascontiguousarray(strikes, dtype=np.float64)
+    cdf = _cumulative_density(strikes, density)
+    bounds = np.array(list(scenarios.values()), dtype=float)
+    lower = np.interp(bounds[:, 0], strikes, cdf)
+    upper = np.interp(bounds[:, 1], strikes, cdf)
     
-    return probabilities
+    return {
+        scenario_name: float(prob)
+        for scenario_name, prob in zip(scenarios, upper - lower)
+    }
 
 
 def calculate_probability_shifts(
     probs1: Dict[str, float], 
     probs2: Dict[str, float]
 ) -> Dict[str, float]:
-    shifts = {}
+    # Keeps probs1 scenario order, which is the order the bands are reported in
+    return {
+        scenario: probs2[scenario] - prob
+        for scenario, prob in probs1.items()
+        if scenario in probs2
+    }
+
+# Standard scenario bands as (name, lower offset, upper offset) from the policy rate.
+# A lower offset of None means the band starts at 0%.
+POLICY_SCENARIO_OFFSETS = (
+    ("Deep Recession", None, -2.00),
+    ("Mild Recession", -2.00, -0.25),
+    ("Neutral", -0.25, 0.25),
+    ("Hikes", 0.25, 2.00),
+    ("Aggressive Hikes", 2.00, 3.50),
+)
+
+
+def build_policy_scenarios(policy_rate: float) -> Dict[str, Tuple[float, float]]:
+    """Build the standard contiguous scenario bands anchored on the policy rate."""
+    scenarios = {}
     
-    for scenario in probs1.keys():
-        if scenario in probs2:
-            shift = probs2[scenario] - probs1[scenario]
-            shifts[scenario] = shift
+    for scenario_name, lower_offset, upper_offset in POLICY_SCENARIO_OFFSETS:
+        lower = 0.0 if lower_offset is None else policy_rate + lower_offset
+        upper = policy_rate + upper_offset
+        scenarios[scenario_name] = (
+            round(max(lower, 0.0), 2),
+            round(max(upper, 0.0), 2)
+        )
     
-    return shifts
\ No newline at end of file
+    return scenarios
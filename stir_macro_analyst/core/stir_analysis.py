@@ -1,30 +1,75 @@
 # core/stir_analysis.py
 
 """Complete STIR analysis orchestration."""
+import asyncio
+import copy
 import logging
 import pandas as pd
 import numpy as np
-from datetime import datetime, date as dt_date
-from typing import Dict, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Hashable
 from .contracts import normalize_ticker, infer_currency
 from .market_data import (
     get_futures_settlement,
     get_option_chain_filtered,
+    get_option_strikes,
+    filter_otm_options,
     get_option_settlements,
     get_discount_curve
 )
-from .rates_engine import interpolate_discount_rate
-from .sabr_calibration import calculate_implied_vol, calibrate_sabr
-from .rnd_engine import generate_rnd
+from .rates_engine import interpolate_discount_rate, parse_yyyymmdd
+from .sabr_calibration import SABRParameters, calibrate_from_prices
+from .rnd_engine import RND_GRID_POINTS, generate_rnd_on_grid
 from .scenarios import compute_scenario_probabilities
-from ..infra import (
-    BloombergConnection,
-    fetch_reference_data,
-    BBG_HOST,
-    BBG_PORT
-)
 logger = logging.getLogger(__name__)
 
+# Analyses currently running, keyed by their arguments (single-flight)
+_inflight: Dict[Hashable, asyncio.Future] = {}
+
+# Long-lived workers for the two date legs of analyze_stir_contract_pair: each
+# thread keeps one Bloomberg session (shared_connection), so a pool per call
+# would open new sessions on every comparison
+_PAIR_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stir-pair")
+
+
+async def analyze_stir_contract_async(
+    contract: str,
+    date: str,
+    scenarios: Dict[str, Tuple[float, float]],
+    min_settlement_price: float = 0.02
+) -> Dict[str, Any]:
+    """
+    Runs analyze_stir_contract in a worker thread, coalescing identical concurrent calls.
+    
+    A call with the same contract, date, scenarios (in the same order) and threshold
+    as one still running awaits that computation instead of downloading and
+    calibrating again. Each caller gets its own deep copy of the result.
+    
+    Args and Returns: as analyze_stir_contract
+    """
+    key = (
+        contract.upper().strip(),
+        date,
+        # Ordered: the probability dicts and band colours follow the scenario order
+        tuple((name, tuple(rate_range)) for name, rate_range in scenarios.items()),
+        min_settlement_price
+    )
+    
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(
+            asyncio.to_thread(analyze_stir_contract, contract, date, scenarios, min_settlement_price)
+        )
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info(f"Joining in-flight analysis of {contract} on {date}")
+    
+    # Shielded: one caller being cancelled must not cancel the shared computation
+    result = await asyncio.shield(future)
+    return copy.deepcopy(result)
+
+
 def analyze_stir_contract(
     contract: str,
     date: str,
@@ -52,9 +97,7 @@ def analyze_stir_contract(
     logger.info("ho chiamato infer_currency()...")
 
     # Get futures settlement
-    fut_data = get_futures_settlement(normalized_ticker, date)
-    fut_settle = fut_data["settlement_price"]
-    forward_rate = 100 - fut_settle
+    fut_settle = get_futures_settlement(normalized_ticker, date)["settlement_price"]
     logger.info("ho chiamato get_futures_settlement()...")
 
     # Get option chain (OTM only)
@@ -64,89 +107,112 @@ def analyze_stir_contract(
     if len(option_tickers) == 0:
         raise ValueError(f"No options found for {contract} on {date}")
     
+    # Get discount curve
+    curve_df = get_discount_curve(currency, date)
+    logger.info("ho chiamato get_discount_curve()...")
+
+    return _analyze_snapshot(
+        normalized_ticker, currency, date, scenarios, min_settlement_price,
+        fut_settle, option_tickers, curve_df
+    )
+
+
+def analyze_stir_contract_pair(
+    contract: str,
+    date1: str,
+    date2: str,
+    scenarios: Dict[str, Tuple[float, float]],
+    min_settlement_price: float = 0.02
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Runs analyze_stir_contract for two dates of the same contract with shared setup.
+    
+    The date-independent work is done once: ticker normalization, currency inference
+    and the option chain download (the option expiry is cached per series by
+    get_option_settlements). The discount curve is fetched once when both dates
+    are the same. The date-dependent legs (option settlements, implied vols, SABR,
+    RND) then run concurrently.
+    
+    Args:
+        contract: Futures ticker (e.g., 'SFRZ6', 'ERH5')
+        date1: First analysis date in YYYYMMDD format
+        date2: Second analysis date in YYYYMMDD format
+        scenarios: Dict of {scenario_name: (min_rate, max_rate)}
+        min_settlement_price: Minimum option settlement to include
+    
+    Returns:
+        Tuple of the two analysis results, in the order (date1, date2)
+    """
+    normalized_ticker = normalize_ticker(contract)
+    currency = infer_currency(normalized_ticker)
+    dates = [date1, date2]
+
+    strikes = get_option_strikes(normalized_ticker)
+    if len(strikes) == 0:
+        raise ValueError(f"No options found for {contract}")
+
+    fut_settles: List[float] = []
+    option_tickers: List[List[str]] = []
+    curves: Dict[str, pd.DataFrame] = {}
+    for d in dates:
+        fut_settle = get_futures_settlement(normalized_ticker, d)["settlement_price"]
+        fut_settles.append(fut_settle)
+        option_tickers.append(filter_otm_options(normalized_ticker, strikes, fut_settle))
+        if d not in curves:
+            curves[d] = get_discount_curve(currency, d)
+
+    futures = [
+        _PAIR_EXECUTOR.submit(
+            _analyze_snapshot,
+            normalized_ticker, currency, d, scenarios, min_settlement_price,
+            fut_settle, tickers, curves[d]
+        )
+        for d, fut_settle, tickers in zip(dates, fut_settles, option_tickers)
+    ]
+    result1, result2 = [f.result() for f in futures]
+
+    return result1, result2
+
+
+def _analyze_snapshot(
+    normalized_ticker: str,
+    currency: str,
+    date: str,
+    scenarios: Dict[str, Tuple[float, float]],
+    min_settlement_price: float,
+    fut_settle: float,
+    option_tickers: List[str],
+    curve_df: pd.DataFrame
+) -> Dict[str, Any]:
+    """Date-dependent part of the analysis, from option settlements to scenario probabilities."""
+    forward_rate = 100 - fut_settle
+
     # Get option settlements
     opt_df = get_option_settlements(option_tickers, date)
+    expiry_date = opt_df.attrs['opt_expire_dt']
     opt_df = opt_df[opt_df['SETTLEMENT'] >= min_settlement_price]
     logger.info("ho chiamato get_option_settlements()...")
 
     if len(opt_df) < 5:
         raise ValueError(f"Insufficient options: only {len(opt_df)} with settlement >= {min_settlement_price}")
-    
-    # Get discount curve
-    curve_df = get_discount_curve(currency, date)
-    logger.info("ho chiamato get_discount_curve()...")
 
-    # Get option expiry
-    with BloombergConnection(BBG_HOST, BBG_PORT) as conn:
-        exp_df = fetch_reference_data(conn, [option_tickers[0]], ["OPT_EXPIRE_DT"])
-    
-    expiry_raw = exp_df.iloc[0]["OPT_EXPIRE_DT"]
-
-    # Gestione robusta del tipo restituito
-    if isinstance(expiry_raw, datetime):
-        expiry_date = expiry_raw.date()
-    elif isinstance(expiry_raw, dt_date):
-        expiry_date = expiry_raw
-    elif isinstance(expiry_raw, pd.Timestamp):
-        expiry_date = expiry_raw.date()
-    else:
-        # fallback: prova a parseare come stringa ISO
-        expiry_date = datetime.strptime(str(expiry_raw), "%Y-%m-%d").date()
-
-    date_obj = datetime.strptime(date, "%Y%m%d").date()
+    date_obj = parse_yyyymmdd(date)
     dte = (expiry_date - date_obj).days
     tau = dte / 365.0
     logger.info(" chiamo  interpolate_discount_rate()...")
-    # Interpolate discount rate
-    rfr = interpolate_discount_rate(curve_df, dte) / 100
-    
-    # Calculate implied volatilities
-    implied_vols = []
-    for _, row in opt_df.iterrows():
-        iv = calculate_implied_vol(
-            row['SETTLEMENT'],
-            fut_settle,
-            row['STRIKE'],
-            tau,
-            rfr,
-            row['OPTION_TYPE']
-        )
-        implied_vols.append(iv)
-    
-    opt_df['IVOL'] = implied_vols
-    opt_df = opt_df[opt_df['IVOL'] > 0]
+    # Interpolate discount rate: get_discount_curve already returns clean, sorted nodes
+    rfr = interpolate_discount_rate(curve_df, dte, clean=False) / 100
     
-    if len(opt_df) < 5:
-        raise ValueError("Insufficient options after IV calculation")
-    
-    # Calibrate SABR
-    sabr_params = calibrate_sabr(
+    # Implied vols and SABR calibration on the settlement arrays
+    sabr_params, num_options_used = calibrate_from_prices(
         fut_settle,
-        opt_df['STRIKE'].tolist(),
-        opt_df['IVOL'].tolist(),
+        opt_df['STRIKE'].to_numpy(),
+        opt_df['SETTLEMENT'].to_numpy(),
+        opt_df['OPTION_TYPE'].to_numpy(),
         tau,
         rfr
     )
     
-    # Generate RND in price space
-    all_rates = [r for scenario_range in scenarios.values() for r in scenario_range]
-    min_rate = min(all_rates)
-    max_rate = max(all_rates)
-    
-    min_price_strike = 100 - max_rate
-    max_price_strike = 100 - min_rate
-    
-    strikes_price, density = generate_rnd(sabr_params, min_price_strike, max_price_strike)
-    
-    # Convert strikes from price space to rate space
-    strikes_rate = 100 - strikes_price
-    strikes_rate = np.flip(strikes_rate)
-    density = np.flip(density)
-    
-    # Compute scenario probabilities
-    probabilities = compute_scenario_probabilities(strikes_rate, density, scenarios)
-    probabilities_pct = {k: v * 100 for k, v in probabilities.items()}
-    
     return {
         "success": True,
         "contract": normalized_ticker,
@@ -163,12 +229,62 @@ def analyze_stir_contract(
             "tau": sabr_params.tau,
             "rfr": sabr_params.rfr
         },
+        **_scenario_fields(sabr_params, scenarios),
+        "num_options_used": num_options_used
+    }
+
+
+def rescore_stir_analysis(
+    result: Dict[str, Any],
+    scenarios: Dict[str, Tuple[float, float]]
+) -> Dict[str, Any]:
+    """
+    Recomputes the RND and scenario probabilities of an analysis result for new scenarios.
+    
+    The SABR fit does not depend on the scenarios, so the stored parameters are reused:
+    no Bloomberg download and no calibration, only the RND on the new rate range.
+    
+    Args:
+        result: Output of analyze_stir_contract
+        scenarios: Dict of {scenario_name: (min_rate, max_rate)}
+    
+    Returns:
+        A new result dict, with rnd_data, scenarios and probabilities for `scenarios`
+    """
+    sabr_params = SABRParameters(
+        **result["sabr_parameters"],
+        forward=result["futures_settlement"]
+    )
+    return {**result, **_scenario_fields(sabr_params, scenarios)}
+
+
+def _scenario_fields(
+    sabr_params: SABRParameters,
+    scenarios: Dict[str, Tuple[float, float]]
+) -> Dict[str, Any]:
+    """RND over the scenario rate range and the probability of each scenario."""
+    # Generate RND over the scenario rate range
+    all_rates = np.fromiter(
+        (r for scenario_range in scenarios.values() for r in scenario_range),
+        dtype=np.float64
+    )
+    min_rate = float(all_rates.min())
+    max_rate = float(all_rates.max())
+    
+    # Grid built ascending in rate space; the density is the same in price space (|dK/dr| = 1)
+    strikes_rate = np.linspace(min_rate, max_rate, RND_GRID_POINTS)
+    density = generate_rnd_on_grid(sabr_params, 100 - strikes_rate)
+    
+    # Compute scenario probabilities
+    probabilities = compute_scenario_probabilities(strikes_rate, density, scenarios)
+    probabilities_pct = {k: v * 100 for k, v in probabilities.items()}
+    
+    return {
         "rnd_data": {
             "strikes": strikes_rate.tolist(),
             "density": density.tolist()
         },
         "scenarios": scenarios,
         "scenario_probabilities": probabilities,
-        "scenario_probabilities_pct": probabilities_pct,
-        "num_options_used": len(opt_df)
-    }
\ No newline at end of file
+        "scenario_probabilities_pct": probabilities_pct
+    }
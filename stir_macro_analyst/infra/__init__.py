@@ -3,23 +3,31 @@
 from .config import (
     BBG_HOST,
     BBG_PORT,
+    STIR_CACHE_DIR,
     POLICY_RATE_MAPPING,
     DISCOUNT_CURVE_MAPPING
 )
 from .bbg_client import (
     BloombergConnection,
+    shared_connection,
     fetch_reference_data,
     fetch_historical_data,
+    fetch_historical_data_multi,
     fetch_option_chain
 )
+from .disk_cache import get_disk_cache
 
 __all__ = [
     'BBG_HOST',
     'BBG_PORT',
+    'STIR_CACHE_DIR',
     'POLICY_RATE_MAPPING',
     'DISCOUNT_CURVE_MAPPING',
     'BloombergConnection',
+    'shared_connection',
     'fetch_reference_data',
     'fetch_historical_data',
-    'fetch_option_chain'
+    'fetch_historical_data_multi',
+    'fetch_option_chain',
+    'get_disk_cache'
 ]
\ No newline at end of file
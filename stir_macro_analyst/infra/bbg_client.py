@@ -1,18 +1,32 @@
 # infra/bbg_client.py
 
-import blpapi
+import atexit
+import threading
+import time
+import weakref
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Optional, List, Any
+from cachetools import TTLCache
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, List, Any, Tuple
+from .disk_cache import get_disk_cache
+
+# blpapi is imported where it is used, so importing the package does not load it
+if TYPE_CHECKING:
+    import blpapi
 
 
 class BloombergConnection:
     def __init__(self, host: str, port: int):
         self.host = host
         self.port = port
-        self.session: Optional[blpapi.Session] = None
+        self.session: Optional['blpapi.Session'] = None
+        self.refdata: Optional['blpapi.Service'] = None
         
     def __enter__(self) -> 'BloombergConnection':
+        import blpapi
+
         session_options = blpapi.SessionOptions()
         session_options.setServerHost(self.host)
         session_options.setServerPort(self.port)
@@ -23,19 +37,122 @@ class BloombergConnection:
             raise ConnectionError("Failed to start Bloomberg session")
         if not self.session.openService("//blp/refdata"):
             raise ConnectionError("Failed to open //blp/refdata service")
+        # Resolved once per session rather than on every request
+        self.refdata = self.session.getService("//blp/refdata")
             
         return self
     
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         if self.session:
             self.session.stop()
+            self.session = None
+            self.refdata = None
+
+
+# One open session per (thread, host, port): blpapi's synchronous nextEvent loop
+# must not be shared between threads
+_thread_local = threading.local()
+_open_connections: List[BloombergConnection] = []
+_open_connections_lock = threading.Lock()
+
+
+class _ThreadConnections(dict):
+    """A thread's open sessions, closed when the thread ends (its thread-local is released)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        # The finalizer holds the connections list, not this dict
+        self._conns: List[BloombergConnection] = []
+        weakref.finalize(self, _close_each, self._conns)
+
+    def add(self, key: Tuple[str, int], conn: BloombergConnection) -> None:
+        self[key] = conn
+        self._conns.append(conn)
+
+    def discard(self, key: Tuple[str, int]) -> None:
+        conn = self.pop(key, None)
+        if conn in self._conns:
+            self._conns.remove(conn)
 
 
-def safe_get_element(field_data: Any, element_name: str, default: float = 0.0) -> float:
+@contextmanager
+def shared_connection(host: str, port: int) -> Iterator[BloombergConnection]:
+    """
+    Drop-in for `with BloombergConnection(host, port) as conn`, reusing a session.
+    
+    The session is opened on the first use in each thread and kept open until
+    that thread ends (or the process exits), so repeated fetches skip the
+    connect + service-open handshake. Threads should therefore be long-lived,
+    e.g. a module-level pool, not one pool per call.
+    If the block raises, the session is closed and the next use reconnects.
+    """
+    connections: Optional[_ThreadConnections] = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = _ThreadConnections()
+    conn = connections.get((host, port))
+    if conn is None:
+        conn = BloombergConnection(host, port).__enter__()
+        connections.add((host, port), conn)
+        with _open_connections_lock:
+            _open_connections.append(conn)
+    
     try:
-        return field_data.getElementAsFloat(element_name)
+        yield conn
     except Exception:
-        return default
+        connections.discard((host, port))
+        _close(conn)
+        raise
+
+
+def _close(conn: BloombergConnection) -> None:
+    with _open_connections_lock:
+        if conn in _open_connections:
+            _open_connections.remove(conn)
+    try:
+        conn.__exit__(None, None, None)
+    except Exception:
+        pass
+
+
+def _close_each(connections: List[BloombergConnection]) -> None:
+    for conn in list(connections):
+        _close(conn)
+
+
+@atexit.register
+def _close_all() -> None:
+    with _open_connections_lock:
+        connections = list(_open_connections)
+    _close_each(connections)
+
+
+# nextEvent() poll interval, and the longest a request may wait for its RESPONSE
+BBG_EVENT_TIMEOUT_MS = 1000
+BBG_REQUEST_TIMEOUT_S = 30.0
+
+
+def _drain_events(
+    connection: BloombergConnection,
+    timeout_ms: int = BBG_EVENT_TIMEOUT_MS,
+    max_wait_s: float = BBG_REQUEST_TIMEOUT_S
+) -> Iterator['blpapi.Message']:
+    """
+    Yields the messages answering the last request sent, up to its final RESPONSE.
+    
+    Raises TimeoutError when the RESPONSE has not arrived within max_wait_s, so a
+    stalled session fails the call (and is discarded by shared_connection)
+    instead of blocking it forever.
+    """
+    import blpapi
+    
+    deadline = time.monotonic() + max_wait_s
+    while time.monotonic() < deadline:
+        event = connection.session.nextEvent(timeout_ms)
+        yield from event
+        if event.eventType() == blpapi.Event.RESPONSE:
+            return
+    
+    raise TimeoutError(f"No Bloomberg response within {max_wait_s:.0f}s")
 
 
 def fetch_reference_data(
@@ -44,9 +161,7 @@ def fetch_reference_data(
     fields: List[str],
     date: Optional[str] = None
 ) -> pd.DataFrame:
-    
-    ref_data_service = connection.session.getService("//blp/refdata")
-    request = ref_data_service.createRequest("ReferenceDataRequest")
+    request = connection.refdata.createRequest("ReferenceDataRequest")
     
     for security in securities:
         request.append("securities", security)
@@ -61,32 +176,72 @@ def fetch_reference_data(
     data = {field: [] for field in fields}
     data['security'] = []
     
-    while True:
-        event = connection.session.nextEvent()
-        if event.eventType() == blpapi.Event.RESPONSE:
-            for msg in event:
-                if msg.hasElement("securityData"):
-                    security_data = msg.getElement("securityData")
-                    for i in range(security_data.numValues()):
-                        security = security_data.getValueAsElement(i)
-                        data['security'].append(security.getElementAsString("security"))
-                        
-                        if security.hasElement("fieldData"):
-                            field_data = security.getElement("fieldData")
-                            for field in fields:
-                                try:
-                                    if field_data.hasElement(field):
-                                        value = field_data.getElement(field).getValue()
-                                        data[field].append(value)
-                                    else:
-                                        data[field].append(None)
-                                except Exception:
-                                    data[field].append(None)
-            break
+    for msg in _drain_events(connection):
+        if msg.hasElement("securityData"):
+            security_data = msg.getElement("securityData")
+            for security in security_data.values():
+                data['security'].append(security.getElementAsString("security"))
+                
+                if security.hasElement("fieldData"):
+                    field_data = security.getElement("fieldData")
+                    for field in fields:
+                        try:
+                            if field_data.hasElement(field):
+                                value = field_data.getElement(field).getValue()
+                                data[field].append(value)
+                            else:
+                                data[field].append(None)
+                        except Exception:
+                            data[field].append(None)
     
     return pd.DataFrame(data)
 
 
+# History of (security, field, start_date, end_date, period) ending before the previous
+# business day no longer changes, so it is kept in memory and on disk. More recent ranges
+# may still be revised: with nonTradingDayFillMethod=PREVIOUS_VALUE, a settlement not yet
+# published comes back filled with the day before's value instead of missing.
+HISTORICAL_CACHE_TTL = 24 * 3600
+# On disk the entries outlive restarts, so warm re-runs need no Bloomberg round trip
+HISTORICAL_DISK_CACHE_TTL = 30 * 24 * 3600
+_historical_cache: TTLCache = TTLCache(maxsize=10_000, ttl=HISTORICAL_CACHE_TTL)
+_historical_cache_lock = threading.Lock()
+
+HistoryKey = Tuple[str, str, str, str, str]
+
+
+def _get_cached_history(key: HistoryKey) -> Optional[pd.DataFrame]:
+    with _historical_cache_lock:
+        df = _historical_cache.get(key)
+    
+    if df is None:
+        df = get_disk_cache().get(("bbg_history",) + key)
+        if df is None:
+            return None
+        with _historical_cache_lock:
+            _historical_cache[key] = df
+    
+    # Callers get their own frame, the cached one stays untouched
+    return df.copy()
+
+
+def _is_settled(end_date: str) -> bool:
+    """True if end_date (YYYYMMDD) is before the previous business day (UTC: any exchange has settled)."""
+    today = datetime.now(timezone.utc).date()
+    previous_business_day = np.busday_offset(today, -1, roll='backward')
+    return np.datetime64(f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:]}") < previous_business_day
+
+
+def _cache_history(key: HistoryKey, df: pd.DataFrame) -> None:
+    end_date = key[3]
+    if df.empty or not _is_settled(end_date):
+        return
+    
+    with _historical_cache_lock:
+        _historical_cache[key] = df.copy()
+    get_disk_cache().set(("bbg_history",) + key, df, expire=HISTORICAL_DISK_CACHE_TTL)
+
+
 def fetch_historical_data(
     connection: BloombergConnection,
     security: str,
@@ -95,11 +250,61 @@ def fetch_historical_data(
     end_date: str,
     period: str = "DAILY"
 ) -> pd.DataFrame:
+    """HistoricalDataRequest for one security; past ranges are served from cache."""
+    key = (security, field, start_date, end_date, period)
+    df = _get_cached_history(key)
+    if df is None:
+        df = _request_historical_data(connection, [security], field, start_date, end_date, period)[security]
+        _cache_history(key, df)
+    return df
+
+
+def fetch_historical_data_multi(
+    connection: BloombergConnection,
+    securities: List[str],
+    field: str,
+    start_date: str,
+    end_date: str,
+    period: str = "DAILY"
+) -> Dict[str, pd.DataFrame]:
+    """
+    fetch_historical_data for many securities in one HistoricalDataRequest.
     
-    ref_data_service = connection.session.getService("//blp/refdata")
-    request = ref_data_service.createRequest("HistoricalDataRequest")
+    Returns {security: DataFrame} in the same format as fetch_historical_data,
+    with an empty DataFrame for securities without data. Only the securities
+    not already cached are requested.
+    """
+    result: Dict[str, pd.DataFrame] = {}
+    missing: List[str] = []
+    for security in dict.fromkeys(securities):
+        df = _get_cached_history((security, field, start_date, end_date, period))
+        if df is None:
+            missing.append(security)
+        else:
+            result[security] = df
     
-    request.getElement("securities").appendValue(security)
+    if missing:
+        fetched = _request_historical_data(connection, missing, field, start_date, end_date, period)
+        for security, df in fetched.items():
+            _cache_history((security, field, start_date, end_date, period), df)
+            result[security] = df
+    
+    return {security: result[security] for security in dict.fromkeys(securities)}
+
+
+def _request_historical_data(
+    connection: BloombergConnection,
+    securities: List[str],
+    field: str,
+    start_date: str,
+    end_date: str,
+    period: str
+) -> Dict[str, pd.DataFrame]:
+    request = connection.refdata.createRequest("HistoricalDataRequest")
+    
+    securities_element = request.getElement("securities")
+    for security in securities:
+        securities_element.appendValue(security)
     request.getElement("fields").appendValue(field)
     request.set("periodicityAdjustment", "ACTUAL")
     request.set("periodicitySelection", period)
@@ -111,34 +316,47 @@ def fetch_historical_data(
     
     connection.session.sendRequest(request)
     
-    dates = []
-    values = []
-    
-    while True:
-        event = connection.session.nextEvent(500)
-        for msg in event:
-            if msg.hasElement("securityData"):
-                field_data_array = msg.getElement("securityData").getElement("fieldData")
-                for x in range(field_data_array.numValues()):
-                    field_data = field_data_array.getValueAsElement(x)
-                    dates.append(field_data.getElement("date").getValueAsDatetime())
-                    values.append(safe_get_element(field_data, field))
-        
-        if event.eventType() == blpapi.Event.RESPONSE:
-            break
+    # Per security, the (dates, values) arrays of each securityData chunk received
+    chunks: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {security: [] for security in securities}
     
-    df = pd.DataFrame({'DATE': dates, field: values})
-    df = df.set_index('DATE')
-    return df
+    for msg in _drain_events(connection):
+        if msg.hasElement("securityData"):
+            # One securityData per message, each in its own (partial) response
+            security_data = msg.getElement("securityData")
+            security = security_data.getElementAsString("security")
+            if security not in chunks or not security_data.hasElement("fieldData"):
+                continue
+            field_data_array = security_data.getElement("fieldData")
+            n = field_data_array.numValues()
+            dates = np.empty(n, dtype='datetime64[ns]')
+            values = np.zeros(n, dtype=np.float64)
+            for x, field_data in enumerate(field_data_array.values()):
+                dates[x] = field_data.getElementAsDatetime("date")
+                if field_data.hasElement(field):
+                    values[x] = field_data.getElementAsFloat(field)
+            chunks[security].append((dates, values))
+    
+    return {security: _history_frame(chunks[security], field) for security in securities}
+
+
+def _history_frame(chunks: List[Tuple[np.ndarray, np.ndarray]], field: str) -> pd.DataFrame:
+    if len(chunks) == 1:
+        dates, values = chunks[0]
+    elif chunks:
+        dates = np.concatenate([c[0] for c in chunks])
+        values = np.concatenate([c[1] for c in chunks])
+    else:
+        dates = np.empty(0, dtype='datetime64[ns]')
+        values = np.empty(0, dtype=np.float64)
+    
+    return pd.DataFrame({field: values}, index=pd.DatetimeIndex(dates, name='DATE'))
 
 
 def fetch_option_chain(
     connection: BloombergConnection,
     futures_code: str
 ) -> List[str]:
-    
-    ref_data_service = connection.session.getService("//blp/refdata")
-    request = ref_data_service.createRequest("ReferenceDataRequest")
+    request = connection.refdata.createRequest("ReferenceDataRequest")
     
     request.append("securities", futures_code)
     request.append("fields", "OPT_CHAIN")
@@ -147,22 +365,17 @@ def fetch_option_chain(
     
     option_tickers = []
     
-    while True:
-        event = connection.session.nextEvent()
-        if event.eventType() == blpapi.Event.RESPONSE:
-            for msg in event:
-                if msg.hasElement("securityData"):
-                    security_data = msg.getElement("securityData")
-                    for i in range(security_data.numValues()):
-                        security = security_data.getValueAsElement(i)
-                        if security.hasElement("fieldData"):
-                            field_data = security.getElement("fieldData")
-                            if field_data.hasElement("OPT_CHAIN"):
-                                option_chain = field_data.getElement("OPT_CHAIN")
-                                for option in option_chain.values():
-                                    option_tickers.append(
-                                        option.getElementValue("Security Description")
-                                    )
-            break
+    for msg in _drain_events(connection):
+        if msg.hasElement("securityData"):
+            security_data = msg.getElement("securityData")
+            for security in security_data.values():
+                if security.hasElement("fieldData"):
+                    field_data = security.getElement("fieldData")
+                    if field_data.hasElement("OPT_CHAIN"):
+                        option_chain = field_data.getElement("OPT_CHAIN")
+                        for option in option_chain.values():
+                            option_tickers.append(
+                                option.getElementValue("Security Description")
+                            )
     
     return option_tickers
\ No newline at end of file
@@ -1,7 +1,7 @@
 # infra/config.py
 
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Tuple, Any
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,6 +9,12 @@ load_dotenv()
 BBG_HOST = os.getenv("BBG_HOST", "localhost")
 BBG_PORT = int(os.getenv("BBG_PORT", "8194"))
 
+# Shared on-disk cache, independent of the working directory; point STIR_CACHE_DIR
+# at a writable volume shared by the workers
+STIR_CACHE_DIR = os.path.expanduser(
+    os.getenv("STIR_CACHE_DIR", "~/.cache/stir_macro_analyst")
+)
+
 POLICY_RATE_MAPPING: Dict[str, Dict[str, str]] = {
     "USD": {
         "ticker": "FDTR Index",
@@ -27,8 +33,8 @@ POLICY_RATE_MAPPING: Dict[str, Dict[str, str]] = {
     }
 }
 
-DISCOUNT_CURVE_MAPPING: Dict[str, List[str]] = {
-    "USD": [
+DISCOUNT_CURVE_MAPPING: Dict[str, Tuple[str, ...]] = {
+    "USD": (
         "USOSFR1Z BGN CURNCY",
         "USOSFR2Z BGN CURNCY",
         "USOSFR3Z BGN CURNCY",
@@ -47,8 +53,8 @@ DISCOUNT_CURVE_MAPPING: Dict[str, List[str]] = {
         "USOSFR1F BGN CURNCY",
         "USOSFR2 BGN CURNCY",
         "USOSFR3 BGN CURNCY"
-    ],
-    "EUR": [
+    ),
+    "EUR": (
         "EESWE1Z BGN CURNCY",
         "EESWE2Z BGN CURNCY",
         "EESWE3Z BGN CURNCY",
@@ -67,8 +73,8 @@ DISCOUNT_CURVE_MAPPING: Dict[str, List[str]] = {
         "EESWE1F BGN CURNCY",
         "EESWE2 BGN CURNCY",
         "EESWE3 BGN CURNCY"
-    ],
-    "GBP": [
+    ),
+    "GBP": (
         "BPSWS1Z BGN CURNCY",
         "BPSWS2Z BGN CURNCY",
         "BPSWS3Z BGN CURNCY",
@@ -87,5 +93,5 @@ DISCOUNT_CURVE_MAPPING: Dict[str, List[str]] = {
         "BPSWS1F BGN CURNCY",
         "BPSWS2 BGN CURNCY",
         "BPSWS3 BGN CURNCY"
-    ]
+    )
 }
\ No newline at end of file
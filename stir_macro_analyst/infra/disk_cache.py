@@ -0,0 +1,24 @@
+# infra/disk_cache.py
+
+"""Persistent cache shared across processes and restarts."""
+
+import logging
+from functools import lru_cache
+from .config import STIR_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_disk_cache():
+    """
+    Returns the process-wide diskcache.Cache stored in STIR_CACHE_DIR.
+    
+    Created on first use so that importing the package does not touch the filesystem.
+    diskcache is safe to share between threads and between processes reading
+    the same directory.
+    """
+    import diskcache
+
+    logger.info(f"Opening disk cache at {STIR_CACHE_DIR}")
+    return diskcache.Cache(STIR_CACHE_DIR)
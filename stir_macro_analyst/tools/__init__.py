@@ -3,13 +3,18 @@
 """Tools package for STIR Macro Analyst."""
 
 from .policy_rate_tool import get_policy_rate
-from .stir_scenario_tool import analyze_stir_scenarios
+from .stir_scenario_tool import analyze_stir_scenarios, analyze_stir_scenarios_batch
 from .plot_rnd_tool import plot_rnd_analysis
 from .meeting_dates_tool import count_central_bank_meetings
+from .stir_pipeline_tool import run_full_stir_comparison
+from .formatting_examples_tool import get_formatting_examples
 
 __all__ = [
     'get_policy_rate',
     'analyze_stir_scenarios',
+    'analyze_stir_scenarios_batch',
     'plot_rnd_analysis',
-    'count_central_bank_meetings'
+    'count_central_bank_meetings',
+    'run_full_stir_comparison',
+    'get_formatting_examples'
 ]
@@ -0,0 +1,27 @@
+# tools/formatting_examples_tool.py
+
+"""Formatting Examples Tool - Serves output templates kept out of the system prompt."""
+
+import logging
+from typing import Dict, Any
+from .. import agent_prompt
+
+logger = logging.getLogger(__name__)
+
+
+def get_formatting_examples() -> Dict[str, Any]:
+    """
+    Returns the output templates and a worked scenario design example.
+
+    Call this when unsure how to present scenario bands or the probability tables
+    for single-date and two-date analyses.
+
+    Returns:
+        Dict with the examples text in markdown
+    """
+    logger.info("Serving formatting examples")
+
+    return {
+        "success": True,
+        "examples": agent_prompt.EXAMPLES
+    }
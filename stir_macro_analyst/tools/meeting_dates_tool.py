@@ -5,11 +5,12 @@
 import logging
 from typing import Dict, Any
 from ..core import count_meetings_in_range
+from .prefetch import run_prefetched
 
 logger = logging.getLogger(__name__)
 
 
-def count_central_bank_meetings(
+async def count_central_bank_meetings(
     currency: str,
     start_date: str,
     end_date: str
@@ -50,7 +51,10 @@ def count_central_bank_meetings(
             f"between {start_date} and {end_date}"
         )
         
-        result = count_meetings_in_range(currency, start_date, end_date)
+        result = await run_prefetched(
+            ("meetings", currency, start_date, end_date),
+            count_meetings_in_range, currency, start_date, end_date
+        )
         result["success"] = True
         
         logger.info(
@@ -1,16 +1,233 @@
 # tools/plot_rnd_tool.py
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
+from cachetools import LRUCache
 from google.adk.tools import ToolContext
 from google.genai.types import Part, Blob
 
 logger = logging.getLogger(__name__)
 
+# Agg drawing and PNG encoding (_render_png) run here, off the event loop. Figures
+# are still built on the calling thread: matplotlib figure construction is not thread-safe.
+_RENDER_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="png-render")
+
+
+# zlib level for the Pillow PNG writer (default 6): flat line charts gain little
+# from the slower levels
+_PNG_COMPRESS_LEVEL = 3
+_PNG_DPI = 150
+
+
+def _render_png(fig) -> bytes:
+    """
+    Draws the figure once with Agg and encodes its RGBA buffer with Pillow.
+    
+    savefig(bbox_inches='tight') draws the figure twice (once to measure the
+    tight box); _rnd_figure already places the axes with fixed margins
+    (_MARGINS_IN, via subplots_adjust), so one draw suffices.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+
+    fig.set_dpi(_PNG_DPI)
+    fig.patch.set_facecolor('white')
+    # The figure was closed in pyplot, which detached its Agg canvas
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    size = canvas.get_width_height(physical=True)
+    image = Image.frombuffer(
+        'RGBA', size, canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1
+    ).convert('RGB')
+    
+    buf = BytesIO()
+    image.save(buf, format='png', compress_level=_PNG_COMPRESS_LEVEL)
+    return buf.getvalue()
+
+
+def _render_png_async(fig) -> asyncio.Future:
+    """Starts encoding a finished (already closed) figure in the background."""
+    return asyncio.get_running_loop().run_in_executor(_RENDER_EXECUTOR, _render_png, fig)
+
+
+# Chart key -> PNG bytes. A chart is a pure function of its data, so agent retries
+# and re-plots of the same analysis skip matplotlib entirely
+_PNG_CACHE: LRUCache = LRUCache(maxsize=32)
+
+
+def _render_cached(key: Tuple, build) -> asyncio.Future:
+    """Renders the figure returned by build() in the background, or reuses the PNG for key."""
+    loop = asyncio.get_running_loop()
+    png = _PNG_CACHE.get(key)
+    if png is not None:
+        render = loop.create_future()
+        render.set_result(png)
+        return render
+
+    def store(done: asyncio.Future) -> None:
+        if not done.cancelled() and done.exception() is None:
+            _PNG_CACHE[key] = done.result()
+
+    render = _render_png_async(build())
+    render.add_done_callback(store)
+    return render
+
+
+def _scenarios_key(scenarios: Dict[str, List[float]]) -> Tuple:
+    # In order: band colors follow the scenario order
+    return tuple((name, tuple(map(float, rate_range))) for name, rate_range in scenarios.items())
+
+
+async def _save_png_artifacts(
+    tool_context: ToolContext,
+    renders: List[Tuple[str, asyncio.Future]],
+    artifacts_saved: List[str]
+) -> None:
+    """
+    Saves each background render as a PNG artifact as soon as it is ready.
+
+    The saves run concurrently (one per artifact key); artifacts_saved keeps
+    the order of renders.
+    """
+    async def save(filename: str, render: asyncio.Future) -> None:
+        artifact = Part(
+            inline_data=Blob(
+                data=await render,
+                mime_type="image/png",
+            )
+        )
+        await tool_context.save_artifact(filename, artifact)
+        logger.info(f"Saved artifact: {filename}")
+
+    await asyncio.gather(*[save(filename, render) for filename, render in renders])
+    artifacts_saved.extend(filename for filename, _ in renders)
+
+
+# Label and title styling shared by every RND chart, applied per figure
+# (not to the global rcParams) so other matplotlib users are unaffected
+_RND_RC = {
+    'axes.labelsize': 13,
+    'axes.labelweight': 'bold',
+    'axes.titlesize': 15,
+    'axes.titleweight': 'bold',
+    'axes.titlepad': 20,
+}
+
+# Fixed axes margins in inches (left, right, top, bottom), instead of a
+# tight_layout text measurement pass per chart: room for the bold labels,
+# the padded title and y tick labels as wide as "0.0012"
+_MARGINS_IN = (1.0, 0.25, 0.6, 0.65)
+
+_SCENARIO_COLORS = ('#ff9999', '#ffcc99', '#99ff99', '#99ccff', '#cc99ff')
+_SCENARIO_ALPHA = 0.25
+
+
+def _draw_scenarios(ax, scenarios: Dict[str, List[float]]) -> List[Any]:
+    """
+    Draws every scenario band as one PolyCollection spanning the full height.
+
+    Returns one legend proxy per band, since the collection has a single label.
+    """
+    from matplotlib.collections import PolyCollection
+    from matplotlib.patches import Patch
+
+    bounds = np.array(list(scenarios.values()), dtype=float).reshape(-1, 2)
+    colors = [_SCENARIO_COLORS[idx % len(_SCENARIO_COLORS)] for idx in range(len(bounds))]
+    # Rectangles in (data x, axes y) coordinates, like axvspan
+    verts = [[(lo, 0), (lo, 1), (hi, 1), (hi, 0)] for lo, hi in bounds]
+    ax.add_collection(
+        PolyCollection(
+            verts,
+            facecolors=colors,
+            edgecolors=colors,
+            alpha=_SCENARIO_ALPHA,
+            transform=ax.get_xaxis_transform(),
+            zorder=1,
+        ),
+        autolim=False,
+    )
+
+    return [
+        Patch(facecolor=color, edgecolor=color, alpha=_SCENARIO_ALPHA, label=name)
+        for name, color in zip(scenarios, colors)
+    ]
+
+
+def _rnd_figure(
+    plt,
+    title: str,
+    curves: List[Tuple[np.ndarray, np.ndarray, str, str]],
+    forwards: List[Tuple[float, str, str, float, str]],
+    scenarios: Dict[str, List[float]],
+    figsize: Tuple[float, float] = (12, 7),
+    legend_kwargs: Optional[Dict[str, Any]] = None,
+    xlim: Optional[Tuple[float, float]] = None,
+):
+    """
+    Builds one closed RND chart, ready for _render_png_async.
+
+    curves are (x, y, line style, label) and forwards are
+    (rate, color, line style, alpha, label) vertical lines. Each chart keeps
+    its own figure so that the three comparison charts encode concurrently.
+    """
+    with plt.rc_context(_RND_RC):
+        fig, ax = plt.subplots(figsize=figsize)
+        # Legend entries in drawing order, without re-scanning the axes children
+        handles = []
+        for x, y, style, label in curves:
+            handles += ax.plot(x, y, style, linewidth=2.5, label=label, zorder=3)
+        for fwd, color, linestyle, alpha, label in forwards:
+            handles.append(ax.axvline(
+                fwd,
+                color=color,
+                linestyle=linestyle,
+                linewidth=2,
+                alpha=alpha,
+                label=label,
+                zorder=4,
+            ))
+        scenario_handles = _draw_scenarios(ax, scenarios)
+        ax.set_xlabel('Rate (%)')
+        ax.set_ylabel('Probability Density')
+        ax.set_title(title)
+        ax.legend(
+            handles=handles + scenario_handles,
+            loc='upper right',
+            framealpha=0.95,
+            **(legend_kwargs or {'fontsize': 10})
+        )
+        ax.grid(True, alpha=0.3, linestyle='--', zorder=0)
+        if xlim is not None:
+            ax.set_xlim(*xlim)
+
+        width, height = figsize
+        left, right, top, bottom = _MARGINS_IN
+        fig.subplots_adjust(
+            left=left / width,
+            right=1 - right / width,
+            top=1 - top / height,
+            bottom=bottom / height
+        )
+    plt.close(fig)
+    return fig
+
+
+def _date_figure(plt, x, y, fwd: float, date: str, scenarios, style: str, fwd_color: str):
+    """Single-date RND chart with its forward rate and the scenario bands."""
+    return _rnd_figure(
+        plt,
+        f'Risk Neutral Density - {date}',
+        curves=[(x, y, style, f'{date} RND')],
+        forwards=[(fwd, fwd_color, '--', 0.8, f'Forward Rate: {fwd:.2f}%')],
+        scenarios=scenarios,
+        xlim=(x.min(), x.max()),
+    )
+
 
 def _extract_rnd_components(rnd_analysis: Dict[str, Any], label: str):
     """
@@ -48,8 +265,8 @@ def _extract_rnd_components(rnd_analysis: Dict[str, Any], label: str):
     if missing_rnd:
         raise KeyError(f"{label}: 'rnd_data' missing keys {missing_rnd}")
 
-    x = np.array(rnd_block["strikes"], dtype=float)
-    y = np.array(rnd_block["density"], dtype=float)
+    x = np.ascontiguousarray(rnd_block["strikes"], dtype=np.float64)
+    y = np.ascontiguousarray(rnd_block["density"], dtype=np.float64)
     fwd = float(rnd_analysis["forward_rate"])
     date = str(rnd_analysis["date"])
 
@@ -102,6 +319,12 @@ async def plot_rnd_analysis(
         4. Agent calls plot_rnd_analysis(state_key_1, scenarios, tool_context, state_key_2)
         5. Three charts are generated
     """
+    # Deferred so that importing the tools does not load matplotlib.
+    # Agg explicitly: no GUI backend probe on first use
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     try:
         # Retrieve first analysis from session state
         logger.info(f"Retrieving analysis from state key: {state_key_1}")
@@ -121,8 +344,10 @@ async def plot_rnd_analysis(
         # Determine mode: single-date or comparison
         is_comparison = (state_key_2 is not None)
         
-        colors = ['#ff9999', '#ffcc99', '#99ff99', '#99ccff', '#cc99ff']
+        scenarios_key = _scenarios_key(scenarios)
         artifacts_saved: List[str] = []
+        # (filename, pending PNG bytes): encoding starts as soon as each figure is built
+        renders: List[Tuple[str, asyncio.Future]] = []
 
         if is_comparison:
             # ============= TWO-DATE COMPARISON MODE =============
@@ -142,167 +367,40 @@ async def plot_rnd_analysis(
             
             logger.info(f"Creating RND comparison charts for {date1} vs {date2}")
 
-            # ===== CHART 1: First Date RND =====
-            fig1, ax1 = plt.subplots(figsize=(12, 7))
-            ax1.plot(x1, y1, 'b-', linewidth=2.5, label=f'{date1} RND', zorder=3)
-            ax1.axvline(
-                fwd1,
-                color='darkblue',
-                linestyle='--',
-                linewidth=2,
-                alpha=0.8,
-                label=f'Forward Rate: {fwd1:.2f}%',
-                zorder=4,
-            )
-            for idx, (scenario_name, rate_range) in enumerate(scenarios.items()):
-                min_r, max_r = rate_range
-                color = colors[idx % len(colors)]
-                ax1.axvspan(
-                    min_r,
-                    max_r,
-                    alpha=0.25,
-                    color=color,
-                    label=scenario_name,
-                    zorder=1,
-                )
-            ax1.set_xlabel('Rate (%)', fontsize=13, fontweight='bold')
-            ax1.set_ylabel('Probability Density', fontsize=13, fontweight='bold')
-            ax1.set_title(
-                f'Risk Neutral Density - {date1}',
-                fontsize=15,
-                fontweight='bold',
-                pad=20,
-            )
-            ax1.legend(loc='upper right', fontsize=10, framealpha=0.95)
-            ax1.grid(True, alpha=0.3, linestyle='--', zorder=0)
-            ax1.set_xlim(x1.min(), x1.max())
-
-            buf1 = BytesIO()
-            plt.tight_layout()
-            fig1.savefig(buf1, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-            plt.close(fig1)
-            buf1.seek(0)
-            artifact1 = Part(
-                inline_data=Blob(
-                    data=buf1.read(),
-                    mime_type="image/png",
-                )
-            )
             filename1 = f"rnd_{date1}.png"
-            await tool_context.save_artifact(filename1, artifact1)
-            artifacts_saved.append(filename1)
-            logger.info(f"Saved artifact: {filename1}")
-
-            # ===== CHART 2: Second Date RND =====
-            fig2, ax2 = plt.subplots(figsize=(12, 7))
-            ax2.plot(x2, y2, 'r-', linewidth=2.5, label=f'{date2} RND', zorder=3)
-            ax2.axvline(
-                fwd2,
-                color='darkred',
-                linestyle='--',
-                linewidth=2,
-                alpha=0.8,
-                label=f'Forward Rate: {fwd2:.2f}%',
-                zorder=4,
-            )
-            for idx, (scenario_name, rate_range) in enumerate(scenarios.items()):
-                min_r, max_r = rate_range
-                color = colors[idx % len(colors)]
-                ax2.axvspan(
-                    min_r,
-                    max_r,
-                    alpha=0.25,
-                    color=color,
-                    label=scenario_name,
-                    zorder=1,
-                )
-            ax2.set_xlabel('Rate (%)', fontsize=13, fontweight='bold')
-            ax2.set_ylabel('Probability Density', fontsize=13, fontweight='bold')
-            ax2.set_title(
-                f'Risk Neutral Density - {date2}',
-                fontsize=15,
-                fontweight='bold',
-                pad=20,
-            )
-            ax2.legend(loc='upper right', fontsize=10, framealpha=0.95)
-            ax2.grid(True, alpha=0.3, linestyle='--', zorder=0)
-            ax2.set_xlim(x2.min(), x2.max())
-
-            buf2 = BytesIO()
-            plt.tight_layout()
-            fig2.savefig(buf2, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-            plt.close(fig2)
-            buf2.seek(0)
-            artifact2 = Part(
-                inline_data=Blob(
-                    data=buf2.read(),
-                    mime_type="image/png",
-                )
-            )
+            renders.append((filename1, _render_cached(
+                ('date', date1, fwd1, x1.tobytes(), y1.tobytes(), scenarios_key, 'b-'),
+                lambda: _date_figure(plt, x1, y1, fwd1, date1, scenarios, 'b-', 'darkblue')
+            )))
+
             filename2 = f"rnd_{date2}.png"
-            await tool_context.save_artifact(filename2, artifact2)
-            artifacts_saved.append(filename2)
-            logger.info(f"Saved artifact: {filename2}")
-
-            # ===== CHART 3: Comparison =====
-            fig3, ax3 = plt.subplots(figsize=(14, 8))
-            ax3.plot(x1, y1, 'k--', linewidth=2.5, label=f'{date1} RND', zorder=3)
-            ax3.plot(x2, y2, 'r-', linewidth=2.5, label=f'{date2} RND', zorder=3)
-            ax3.axvline(
-                fwd1,
-                color='black',
-                linestyle=':',
-                linewidth=2,
-                alpha=0.7,
-                label=f'{date1} Forward: {fwd1:.2f}%',
-                zorder=4,
-            )
-            ax3.axvline(
-                fwd2,
-                color='red',
-                linestyle=':',
-                linewidth=2,
-                alpha=0.7,
-                label=f'{date2} Forward: {fwd2:.2f}%',
-                zorder=4,
+            renders.append((filename2, _render_cached(
+                ('date', date2, fwd2, x2.tobytes(), y2.tobytes(), scenarios_key, 'r-'),
+                lambda: _date_figure(plt, x2, y2, fwd2, date2, scenarios, 'r-', 'darkred')
+            )))
+
+            filename3 = f"rnd_comparison_{date1}_vs_{date2}.png"
+            comparison_key = (
+                'comparison', date1, fwd1, x1.tobytes(), y1.tobytes(),
+                date2, fwd2, x2.tobytes(), y2.tobytes(), scenarios_key
             )
-            for idx, (scenario_name, rate_range) in enumerate(scenarios.items()):
-                min_r, max_r = rate_range
-                color = colors[idx % len(colors)]
-                ax3.axvspan(
-                    min_r,
-                    max_r,
-                    alpha=0.25,
-                    color=color,
-                    label=scenario_name,
-                    zorder=1,
-                )
-            ax3.set_xlabel('Rate (%)', fontsize=13, fontweight='bold')
-            ax3.set_ylabel('Probability Density', fontsize=13, fontweight='bold')
-            ax3.set_title(
+            renders.append((filename3, _render_cached(comparison_key, lambda: _rnd_figure(
+                plt,
                 f'RND Comparison: {date1} vs {date2}',
-                fontsize=15,
-                fontweight='bold',
-                pad=20,
-            )
-            ax3.legend(loc='upper right', fontsize=9, framealpha=0.95, ncol=2)
-            ax3.grid(True, alpha=0.3, linestyle='--', zorder=0)
-
-            buf3 = BytesIO()
-            plt.tight_layout()
-            fig3.savefig(buf3, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-            plt.close(fig3)
-            buf3.seek(0)
-            artifact3 = Part(
-                inline_data=Blob(
-                    data=buf3.read(),
-                    mime_type="image/png",
-                )
-            )
-            filename3 = f"rnd_comparison_{date1}_vs_{date2}.png"
-            await tool_context.save_artifact(filename3, artifact3)
-            artifacts_saved.append(filename3)
-            logger.info(f"Saved artifact: {filename3}")
+                curves=[
+                    (x1, y1, 'k--', f'{date1} RND'),
+                    (x2, y2, 'r-', f'{date2} RND'),
+                ],
+                forwards=[
+                    (fwd1, 'black', ':', 0.7, f'{date1} Forward: {fwd1:.2f}%'),
+                    (fwd2, 'red', ':', 0.7, f'{date2} Forward: {fwd2:.2f}%'),
+                ],
+                scenarios=scenarios,
+                figsize=(14, 8),
+                legend_kwargs={'fontsize': 9, 'ncol': 2},
+            ))))
+
+            await _save_png_artifacts(tool_context, renders, artifacts_saved)
 
             logger.info("All RND charts created successfully")
             return {
@@ -322,56 +420,13 @@ async def plot_rnd_analysis(
             # ============= SINGLE-DATE MODE =============
             logger.info(f"Creating single-date RND chart for {date1}")
             
-            # ===== SINGLE CHART: RND with Scenarios =====
-            fig, ax = plt.subplots(figsize=(12, 7))
-            ax.plot(x1, y1, 'b-', linewidth=2.5, label=f'{date1} RND', zorder=3)
-            ax.axvline(
-                fwd1,
-                color='darkblue',
-                linestyle='--',
-                linewidth=2,
-                alpha=0.8,
-                label=f'Forward Rate: {fwd1:.2f}%',
-                zorder=4,
-            )
-            for idx, (scenario_name, rate_range) in enumerate(scenarios.items()):
-                min_r, max_r = rate_range
-                color = colors[idx % len(colors)]
-                ax.axvspan(
-                    min_r,
-                    max_r,
-                    alpha=0.25,
-                    color=color,
-                    label=scenario_name,
-                    zorder=1,
-                )
-            ax.set_xlabel('Rate (%)', fontsize=13, fontweight='bold')
-            ax.set_ylabel('Probability Density', fontsize=13, fontweight='bold')
-            ax.set_title(
-                f'Risk Neutral Density - {date1}',
-                fontsize=15,
-                fontweight='bold',
-                pad=20,
-            )
-            ax.legend(loc='upper right', fontsize=10, framealpha=0.95)
-            ax.grid(True, alpha=0.3, linestyle='--', zorder=0)
-            ax.set_xlim(x1.min(), x1.max())
-
-            buf = BytesIO()
-            plt.tight_layout()
-            fig.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-            plt.close(fig)
-            buf.seek(0)
-            artifact = Part(
-                inline_data=Blob(
-                    data=buf.read(),
-                    mime_type="image/png",
-                )
-            )
             filename = f"rnd_{date1}.png"
-            await tool_context.save_artifact(filename, artifact)
-            artifacts_saved.append(filename)
-            logger.info(f"Saved artifact: {filename}")
+            renders.append((filename, _render_cached(
+                ('date', date1, fwd1, x1.tobytes(), y1.tobytes(), scenarios_key, 'b-'),
+                lambda: _date_figure(plt, x1, y1, fwd1, date1, scenarios, 'b-', 'darkblue')
+            )))
+
+            await _save_png_artifacts(tool_context, renders, artifacts_saved)
 
             logger.info("Single-date RND chart created successfully")
             return {
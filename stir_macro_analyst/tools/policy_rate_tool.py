@@ -2,10 +2,10 @@
 """Policy Rate Tool - Retrieves central bank policy rates."""
 
 import logging
-from datetime import datetime
 from typing import Dict, Any, Optional
 
 from ..core import get_policy_rate_for_currency
+from .prefetch import run_prefetched, today_yyyymmdd
 
 logger = logging.getLogger(__name__)
 
@@ -20,22 +20,30 @@ def _normalize_date(date_str: str) -> str:
     - "June 3rd 2025"
     - "3 Jun 2025"
     """
-    from dateutil import parser
-
     # Già nel formato giusto
     if len(date_str) == 8 and date_str.isdigit():
         return date_str
 
+    # ISO "YYYY-MM-DD" / "YYYY/MM/DD": basta rimuovere i separatori
+    if len(date_str) == 10 and date_str[4] == date_str[7] and date_str[4] in "-/":
+        compact = date_str[:4] + date_str[5:7] + date_str[8:]
+        if compact.isdigit():
+            return compact
+
+    # Solo le forme libere passano da dateutil (import differito: ~10 ms)
+    from dateutil import parser
+
     dt = parser.parse(date_str)
     return dt.strftime("%Y%m%d")
 
 
-def get_policy_rate(currency: str, date: Optional[str] = None) -> Dict[str, Any]:
+async def get_policy_rate(currency: str, date: Optional[str] = None) -> Dict[str, Any]:
     """
     Recupera il tasso ufficiale di policy per una valuta.
 
     - Se `date` è None → usa la data odierna (ultimo dato disponibile).
     - Se `date` è valorizzata → usa quella data (storico).
+    - Usa il risultato già prefetchato dal callback, se presente.
 
     Args:
         currency: Codice valuta (USD, EUR, GBP).
@@ -47,14 +55,17 @@ def get_policy_rate(currency: str, date: Optional[str] = None) -> Dict[str, Any]
     """
     try:
         if date is None:
-            normalized_date = datetime.now().strftime("%Y%m%d")
+            normalized_date = today_yyyymmdd()
             
         else:
             normalized_date = _normalize_date(date)
 
         logger.info(f"Retrieving policy rate for {currency} on {normalized_date}")
 
-        result = get_policy_rate_for_currency(currency, normalized_date)
+        result = await run_prefetched(
+            ("policy_rate", currency, normalized_date),
+            get_policy_rate_for_currency, currency, normalized_date
+        )
         result["success"] = True
 
         logger.info(
@@ -0,0 +1,58 @@
+# tools/prefetch.py
+
+"""Registry of speculative lookups started before the model asks for them."""
+
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Unclaimed prefetches are dropped after this many seconds
+PREFETCH_TTL_SECONDS = 300
+
+_tasks: Dict[Hashable, asyncio.Task] = {}
+
+# (day, YYYYMMDD) of the last today_yyyymmdd() call
+_today: Tuple[date, str] = (date.min, "")
+
+
+def today_yyyymmdd() -> str:
+    """Today's date as YYYYMMDD, the form used in prefetch keys; formatted once per day."""
+    global _today
+    day = date.today()
+    if day != _today[0]:
+        _today = (day, f"{day.year:04d}{day.month:02d}{day.day:02d}")
+    return _today[1]
+
+
+def prefetch(key: Hashable, func: Callable[..., Any], *args: Any) -> None:
+    """Starts `func(*args)` in a worker thread unless a prefetch for `key` is pending."""
+    if key in _tasks:
+        return
+
+    loop = asyncio.get_running_loop()
+    task = loop.create_task(asyncio.to_thread(func, *args))
+    _tasks[key] = task
+    logger.info(f"Prefetching {key}")
+
+    def _expire(done: asyncio.Task) -> None:
+        # Mark a failure as retrieved: it is re-raised only if a tool claims the task
+        if not done.cancelled():
+            done.exception()
+        loop.call_later(
+            PREFETCH_TTL_SECONDS,
+            lambda: _tasks.pop(key, None) if _tasks.get(key) is done else None
+        )
+
+    task.add_done_callback(_expire)
+
+
+async def run_prefetched(key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+    """Returns the prefetched result for `key`, or runs `func(*args)` in a worker thread."""
+    task = _tasks.pop(key, None)
+    if task is not None:
+        logger.info(f"Using prefetched {key}")
+        return await task
+    return await asyncio.to_thread(func, *args)
@@ -0,0 +1,143 @@
+# tools/stir_pipeline_tool.py
+
+"""STIR Pipeline Tool - Full two-date STIR comparison in a single tool call."""
+
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional
+from google.adk.tools import ToolContext
+from ..core import (
+    get_policy_rate_for_currency,
+    count_meetings_in_range
+)
+from .prefetch import run_prefetched, today_yyyymmdd
+from .stir_scenario_tool import _to_scenario_tuples, _save_to_state, _get_contract_spec
+from .plot_rnd_tool import plot_rnd_analysis
+
+logger = logging.getLogger(__name__)
+
+
+def _summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields needed to write the final answer (no RND arrays)."""
+    return {
+        "date": result["date"],
+        "state_key": result["state_key"],
+        "futures_settlement": result["futures_settlement"],
+        "forward_rate": result["forward_rate"],
+        "scenario_probabilities_pct": result["scenario_probabilities_pct"],
+        "num_options_used": result["num_options_used"]
+    }
+
+
+async def run_full_stir_comparison(
+    contract: str,
+    date1: str,
+    date2: str,
+    tool_context: ToolContext,
+    scenarios: Optional[Dict[str, List[float]]] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the complete two-date STIR comparison workflow in one call.
+
+    This tool chains locally, without further LLM round-trips:
+    1. Takes the currency from the contract parsed at the start of the turn
+    2. Retrieves the current policy rate and counts central bank meetings
+       between the two dates (concurrently)
+    3. Uses the given scenarios, or builds the standard policy-anchored bands
+       when scenarios is None
+    4. Runs the STIR analysis for both dates with shared setup (one option chain
+       download, one expiry lookup), the two date legs concurrently, and saves each result
+       to session state ("stir_analysis_{contract}_{date}")
+    5. Computes scenario probability shifts between the two dates
+    6. Generates the three RND charts (same as plot_rnd_analysis with two state keys)
+
+    Args:
+        contract: STIR futures ticker (e.g., SFRZ6 for SOFR Dec 2026)
+        date1: First analysis date in YYYYMMDD format (e.g., 20241018)
+        date2: Second analysis date in YYYYMMDD format (e.g., 20250212)
+        tool_context: ADK context (auto-injected, provides access to session state)
+        scenarios: Optional dict mapping scenario names to [min_rate, max_rate] in percentage terms.
+                   If None, the standard bands around the current policy rate are used.
+
+    Returns:
+        Dict with policy context, meeting count, per-date probabilities, probability
+        shifts (in percentage points), forward rate shift and chart filenames
+    """
+    # Deferred: resolving the analysis pulls in scipy, pysabr and Bloomberg
+    from ..core import (
+        analyze_stir_contract_pair,
+        build_policy_scenarios,
+        calculate_probability_shifts
+    )
+
+    try:
+        logger.info(f"Running full STIR comparison for {contract}: {date1} vs {date2}")
+
+        currency = _get_contract_spec(tool_context, contract).currency
+        today = today_yyyymmdd()
+        start_date, end_date = sorted([date1, date2])
+
+        policy, meetings = await asyncio.gather(
+            run_prefetched(
+                ("policy_rate", currency, today),
+                get_policy_rate_for_currency, currency, today
+            ),
+            run_prefetched(
+                ("meetings", currency, start_date, end_date),
+                count_meetings_in_range, currency, start_date, end_date
+            )
+        )
+
+        if scenarios is None:
+            scenarios_tuples = build_policy_scenarios(policy["policy_rate"])
+        else:
+            scenarios_tuples = _to_scenario_tuples(scenarios)
+
+        result1, result2 = await asyncio.to_thread(
+            analyze_stir_contract_pair, contract, date1, date2, scenarios_tuples
+        )
+
+        state_key_1 = _save_to_state(tool_context, contract, date1, result1)
+        state_key_2 = _save_to_state(tool_context, contract, date2, result2)
+
+        shifts_pp = calculate_probability_shifts(
+            result1["scenario_probabilities_pct"],
+            result2["scenario_probabilities_pct"]
+        )
+
+        scenarios_lists = {
+            name: list(rate_range) for name, rate_range in scenarios_tuples.items()
+        }
+        plot_result = await plot_rnd_analysis(
+            state_key_1, scenarios_lists, tool_context, state_key_2
+        )
+
+        logger.info(f"Full STIR comparison complete for {contract}")
+
+        return {
+            "success": True,
+            "contract": result1["contract"],
+            "currency": currency,
+            "policy_rate": policy["policy_rate"],
+            "policy_rate_name": policy["rate_name"],
+            "central_bank": policy["central_bank"],
+            "num_meetings": meetings["num_meetings"],
+            "meeting_type": meetings["meeting_type"],
+            "meetings": meetings["meetings"],
+            "scenarios": scenarios_lists,
+            "date1": _summarize(result1),
+            "date2": _summarize(result2),
+            "probability_shifts_pp": shifts_pp,
+            "forward_rate_shift_bps": (result2["forward_rate"] - result1["forward_rate"]) * 100,
+            "charts": plot_result
+        }
+
+    except Exception as e:
+        logger.error(f"Error running full STIR comparison for {contract}: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "contract": contract,
+            "date1": date1,
+            "date2": date2
+        }
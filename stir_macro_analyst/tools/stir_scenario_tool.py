@@ -2,15 +2,89 @@
 
 """STIR Scenario Tool - Complete STIR analysis with scenario probabilities."""
 
+import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 from google.adk.tools import ToolContext
-from ..core import analyze_stir_contract
+
+if TYPE_CHECKING:
+    from ..core import ContractSpec
 
 logger = logging.getLogger(__name__)
 
+# Session state key of the contract parsed at the start of the turn (ContractSpec as a dict)
+CONTRACT_SPEC_KEY = "contract_spec"
+
+
+def _to_scenario_tuples(scenarios: Dict[str, List[float]]) -> Dict[str, tuple]:
+    """Convert scenarios from list format to tuple format."""
+    return {
+        name: tuple(range_list)
+        for name, range_list in scenarios.items()
+    }
+
+
+def _get_contract_spec(tool_context: ToolContext, contract: str) -> 'ContractSpec':
+    """Contract spec parsed at the start of the turn, or parsed now if it is for another ticker."""
+    from ..core import ContractSpec, normalize_ticker
+
+    stored = tool_context.state.get(CONTRACT_SPEC_KEY)
+    if stored is not None and stored["ticker"] == normalize_ticker(contract):
+        return ContractSpec(**stored)
+    return ContractSpec.from_ticker(contract)
+
+
+def _state_key(contract: str, date: str) -> str:
+    return f"stir_analysis_{contract}_{date}"
+
+
+def _save_to_state(
+    tool_context: ToolContext,
+    contract: str,
+    date: str,
+    result: Dict[str, Any]
+) -> str:
+    """Store an analysis result in session state and return its key."""
+    state_key = _state_key(contract, date)
+    tool_context.state[state_key] = result
+    
+    # Add state_key to result so agent knows where to find it
+    result["state_key"] = state_key
+    return state_key
+
+
+def _from_state(
+    tool_context: ToolContext,
+    contract: str,
+    date: str,
+    scenarios_tuples: Dict[str, tuple]
+) -> Optional[Dict[str, Any]]:
+    """
+    Analysis already in session state for this contract and date, or None.
 
-def analyze_stir_scenarios(
+    With other scenarios, only the RND and the probabilities are recomputed
+    from the stored SABR fit (no Bloomberg download, no calibration).
+    """
+    from ..core import rescore_stir_analysis
+
+    cached = tool_context.state.get(_state_key(contract, date))
+    if cached is None or not cached.get("success", False):
+        return None
+
+    if _to_scenario_tuples(cached["scenarios"]) == scenarios_tuples:
+        logger.info(f"Reusing analysis of {contract} on {date} from session state")
+        return dict(cached)
+
+    logger.info(f"Rescoring stored analysis of {contract} on {date} for new scenarios")
+    return rescore_stir_analysis(cached, scenarios_tuples)
+
+
+def _without_rnd(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Tool response for the LLM: the full result minus the RND arrays, which stay in state."""
+    return {key: value for key, value in result.items() if key != "rnd_data"}
+
+
+async def analyze_stir_scenarios(
     contract: str, 
     date: str, 
     scenarios: Dict[str, List[float]],
@@ -27,6 +101,9 @@ def analyze_stir_scenarios(
     5. Computes probability for each scenario by integrating RND
     6. Automatically saves results to session state for later use
     
+    An analysis already in session state for the same contract and date is reused
+    (with other scenarios, only steps 4-5 are redone from the stored SABR fit).
+    
     Input scenarios should cover the full rate spectrum and be mutually exclusive.
     Typical scenarios: Deep Cut (0-1.5%), Moderate Cut (1.5-3%), Neutral (3-4.5%), Hike (4.5-8%)
     
@@ -43,32 +120,30 @@ def analyze_stir_scenarios(
         tool_context: ADK context (auto-injected, provides access to session state)
     
     Returns:
-        Complete analysis with RND data, scenario probabilities, and state_key for later reference
+        Complete analysis (scenario probabilities, SABR parameters, forward) and state_key
+        for later reference. The RND arrays are only in session state, for plot_rnd_analysis.
     """
+    # Deferred: resolving the analysis pulls in scipy, pysabr and Bloomberg
+    from ..core import analyze_stir_contract_async
+
     try:
         logger.info(f"Analyzing {contract} on {date}")
         
-        # Convert scenarios from list format to tuple format
-        scenarios_tuples = {
-            name: tuple(range_list) 
-            for name, range_list in scenarios.items()
-        }
+        scenarios_tuples = _to_scenario_tuples(scenarios)
         
-        result = analyze_stir_contract(contract, date, scenarios_tuples)
+        result = _from_state(tool_context, contract, date, scenarios_tuples)
+        if result is None:
+            result = await analyze_stir_contract_async(contract, date, scenarios_tuples)
         
         # Auto-save to session state
-        state_key = f"stir_analysis_{contract}_{date}"
-        tool_context.state[state_key] = result
-        
-        # Add state_key to result so agent knows where to find it
-        result["state_key"] = state_key
+        state_key = _save_to_state(tool_context, contract, date, result)
         
         logger.info(
             f"Analysis complete: {len(result['scenario_probabilities'])} scenarios computed. "
             f"Saved to session state with key: {state_key}"
         )
         
-        return result
+        return _without_rnd(result)
         
     except Exception as e:
         logger.error(f"Error analyzing {contract} on {date}: {e}")
@@ -77,4 +152,74 @@ def analyze_stir_scenarios(
             "error": str(e),
             "contract": contract,
             "date": date
-        }
\ No newline at end of file
+        }
+
+
+async def analyze_stir_scenarios_batch(
+    contract: str,
+    dates: List[str],
+    scenarios: Dict[str, List[float]],
+    tool_context: ToolContext
+) -> Dict[str, Any]:
+    """
+    Runs the complete STIR analysis for several dates of the same contract concurrently.
+    
+    Each date is independent (Bloomberg download, SABR calibration, RND), so the
+    analyses run in worker threads at the same time instead of one after the other.
+    Use this instead of calling analyze_stir_scenarios once per date when two dates
+    are requested.
+    
+    Every successful result is stored in session state exactly as analyze_stir_scenarios
+    does, with key: "stir_analysis_{contract}_{date}". Dates already in session state
+    are reused the same way (rescored from the stored SABR fit for other scenarios).
+    
+    Args:
+        contract: STIR futures ticker (e.g., SFRZ6 for SOFR Dec 2026)
+        dates: Analysis snapshot dates in YYYYMMDD format (e.g., ['20241018', '20250212'])
+        scenarios: Dict mapping scenario names to [min_rate, max_rate] in percentage terms.
+        tool_context: ADK context (auto-injected, provides access to session state)
+    
+    Returns:
+        Dict with per-date results (in the order of `dates`, without the RND arrays)
+        and the list of state_keys
+    """
+    from ..core import analyze_stir_contract_async
+
+    logger.info(f"Analyzing {contract} on {len(dates)} dates concurrently: {dates}")
+    
+    scenarios_tuples = _to_scenario_tuples(scenarios)
+    
+    async def analyze(d: str) -> Dict[str, Any]:
+        result = _from_state(tool_context, contract, d, scenarios_tuples)
+        if result is None:
+            result = await analyze_stir_contract_async(contract, d, scenarios_tuples)
+        return result
+    
+    outcomes = await asyncio.gather(*[analyze(d) for d in dates], return_exceptions=True)
+    
+    results: List[Dict[str, Any]] = []
+    state_keys: List[str] = []
+    
+    for d, outcome in zip(dates, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error analyzing {contract} on {d}: {outcome}")
+            results.append({
+                "success": False,
+                "error": str(outcome),
+                "contract": contract,
+                "date": d
+            })
+            continue
+        
+        state_keys.append(_save_to_state(tool_context, contract, d, outcome))
+        results.append(_without_rnd(outcome))
+    
+    logger.info(f"Batch analysis complete: {len(state_keys)}/{len(dates)} dates succeeded")
+    
+    return {
+        "success": len(state_keys) == len(dates),
+        "contract": contract,
+        "dates": dates,
+        "results": results,
+        "state_keys": state_keys
+    }